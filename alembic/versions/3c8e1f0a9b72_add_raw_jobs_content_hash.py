@@ -0,0 +1,117 @@
+"""add_raw_jobs_content_hash
+
+Revision ID: 3c8e1f0a9b72
+Revises: fbbd657b4749
+Create Date: 2026-10-15 09:12:41.208113
+
+"""
+
+import hashlib
+import json
+from collections.abc import Sequence
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c8e1f0a9b72"
+down_revision: str | Sequence[str] | None = "fbbd657b4749"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _has_column(table: str, column: str) -> bool:
+    """Check if a column exists in a table."""
+    bind = op.get_bind()
+    insp = inspect(bind)
+    cols = [c["name"] for c in insp.get_columns(table)]
+    return column in cols
+
+
+def _has_index(table: str, index: str) -> bool:
+    """Check if an index exists on a table."""
+    bind = op.get_bind()
+    insp = inspect(bind)
+    indexes = [idx["name"] for idx in insp.get_indexes(table)]
+    return index in indexes
+
+
+def _content_hash(payload: dict[str, Any]) -> str:
+    """Frozen copy of jobintel.etl.raw.compute_content_hash as of this revision."""
+    stable = {
+        key: payload.get(key)
+        for key in (
+            "source",
+            "external_id",
+            "url",
+            "title",
+            "company",
+            "location",
+            "posted_at",
+            "description",
+        )
+    }
+    blob = json.dumps(stable, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    """Add an indexed raw_jobs.content_hash dedup column.
+
+    Strategy:
+    1. Add nullable content_hash column (idempotent)
+    2. Backfill with the full payload hash, computed in Python. The hash a source
+       put inside payload_json may leave out the URL (Arbeitnow's does), and
+       older ingests deduped on (that hash, url), so it is not unique on its own.
+    3. Clear the hash on any later exact duplicates so the unique index can be built
+    4. Create unique index
+    """
+    idx = op.f("ix_raw_jobs_content_hash")
+
+    if not _has_column("raw_jobs", "content_hash"):
+        op.add_column("raw_jobs", sa.Column("content_hash", sa.String(length=64), nullable=True))
+
+        bind = op.get_bind()
+        rows = bind.execute(sa.text("SELECT id, payload_json FROM raw_jobs")).all()
+        if rows:
+            bind.execute(
+                sa.text("UPDATE raw_jobs SET content_hash = :content_hash WHERE id = :id"),
+                [
+                    {
+                        "id": row_id,
+                        # JSON comes back as text on SQLite, already decoded on Postgres
+                        "content_hash": _content_hash(
+                            json.loads(payload) if isinstance(payload, str) else payload or {}
+                        ),
+                    }
+                    for row_id, payload in rows
+                ],
+            )
+
+        # Keep the earliest row per hash (same source, id, url and content).
+        op.execute("""
+            UPDATE raw_jobs
+            SET content_hash = NULL
+            WHERE content_hash IS NOT NULL
+              AND id NOT IN (
+                SELECT MIN(id) FROM raw_jobs
+                WHERE content_hash IS NOT NULL
+                GROUP BY content_hash
+              )
+        """)
+
+    if not _has_index("raw_jobs", idx):
+        op.create_index(idx, "raw_jobs", ["content_hash"], unique=True)
+
+
+def downgrade() -> None:
+    """Remove content_hash column (idempotent)."""
+    idx = op.f("ix_raw_jobs_content_hash")
+
+    if _has_index("raw_jobs", idx):
+        op.drop_index(idx, table_name="raw_jobs")
+    if _has_column("raw_jobs", "content_hash"):
+        op.drop_column("raw_jobs", "content_hash")
@@ -0,0 +1,52 @@
+"""raw_jobs_payload_jsonb
+
+Revision ID: 4f0d8b3a6e27
+Revises: e1a5f3c8b264
+Create Date: 2026-10-15 22:26:40.915302
+
+"""
+
+from collections.abc import Sequence
+
+from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import JSONB
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f0d8b3a6e27"
+down_revision: str | Sequence[str] | None = "e1a5f3c8b264"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _payload_is_jsonb() -> bool:
+    """Check if raw_jobs.payload_json is already JSONB."""
+    bind = op.get_bind()
+    insp = inspect(bind)
+    col = next(c for c in insp.get_columns("raw_jobs") if c["name"] == "payload_json")
+    return isinstance(col["type"], JSONB)
+
+
+def upgrade() -> None:
+    """Convert raw_jobs.payload_json from JSON to JSONB (Postgres only)."""
+    if op.get_bind().dialect.name != "postgresql" or _payload_is_jsonb():
+        return
+
+    op.execute("""
+        ALTER TABLE raw_jobs
+        ALTER COLUMN payload_json TYPE JSONB
+        USING payload_json::jsonb
+    """)
+
+
+def downgrade() -> None:
+    """Convert raw_jobs.payload_json back to JSON (Postgres only)."""
+    if op.get_bind().dialect.name != "postgresql" or not _payload_is_jsonb():
+        return
+
+    op.execute("""
+        ALTER TABLE raw_jobs
+        ALTER COLUMN payload_json TYPE JSON
+        USING payload_json::json
+    """)
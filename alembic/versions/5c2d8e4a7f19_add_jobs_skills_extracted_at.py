@@ -0,0 +1,67 @@
+"""add_jobs_skills_extracted_at
+
+Revision ID: 5c2d8e4a7f19
+Revises: 7a3c5e9d1b48
+Create Date: 2026-10-16 10:21:37.904412
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2d8e4a7f19"
+down_revision: str | Sequence[str] | None = "7a3c5e9d1b48"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_PENDING = sa.text("skills_extracted_at IS NULL")
+
+
+def _has_column(table: str, column: str) -> bool:
+    """Check if a column exists in a table."""
+    bind = op.get_bind()
+    insp = inspect(bind)
+    cols = [c["name"] for c in insp.get_columns(table)]
+    return column in cols
+
+
+def _has_index(table: str, index: str) -> bool:
+    """Check if an index exists on a table."""
+    bind = op.get_bind()
+    insp = inspect(bind)
+    indexes = [idx["name"] for idx in insp.get_indexes(table)]
+    return index in indexes
+
+
+def upgrade() -> None:
+    """Add jobs.skills_extracted_at and a partial index on pending jobs.
+
+    Existing jobs are left NULL, so the next skills run re-reads them once
+    (already stored skills are skipped) and marks them.
+    """
+    if not _has_column("jobs", "skills_extracted_at"):
+        op.add_column(
+            "jobs", sa.Column("skills_extracted_at", sa.DateTime(timezone=True), nullable=True)
+        )
+
+    if not _has_index("jobs", "idx_jobs_skills_pending"):
+        op.create_index(
+            "idx_jobs_skills_pending",
+            "jobs",
+            ["id"],
+            postgresql_where=_PENDING,
+            sqlite_where=_PENDING,
+        )
+
+
+def downgrade() -> None:
+    """Remove skills_extracted_at and its index (idempotent)."""
+    if _has_index("jobs", "idx_jobs_skills_pending"):
+        op.drop_index("idx_jobs_skills_pending", table_name="jobs")
+    if _has_column("jobs", "skills_extracted_at"):
+        op.drop_column("jobs", "skills_extracted_at")
@@ -0,0 +1,98 @@
+"""add_jobs_source_external_id
+
+Revision ID: 7a3c5e9d1b48
+Revises: 4f0d8b3a6e27
+Create Date: 2026-10-15 22:49:13.380257
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7a3c5e9d1b48"
+down_revision: str | Sequence[str] | None = "4f0d8b3a6e27"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _has_column(table: str, column: str) -> bool:
+    """Check if a column exists in a table."""
+    bind = op.get_bind()
+    insp = inspect(bind)
+    cols = [c["name"] for c in insp.get_columns(table)]
+    return column in cols
+
+
+def _has_index(table: str, index: str) -> bool:
+    """Check if an index exists on a table."""
+    bind = op.get_bind()
+    insp = inspect(bind)
+    indexes = [idx["name"] for idx in insp.get_indexes(table)]
+    return index in indexes
+
+
+def upgrade() -> None:
+    """Add jobs.source / jobs.external_id with a unique (source, external_id) index.
+
+    Strategy:
+    1. Add nullable columns (idempotent)
+    2. Backfill from the earliest raw_jobs row with the same URL
+    3. Clear external_id on later duplicates so the unique index can be built
+    4. Create unique index
+    """
+    idx = "uq_jobs_source_external_id"
+
+    if not _has_column("jobs", "source"):
+        op.add_column("jobs", sa.Column("source", sa.String(), nullable=True))
+        op.add_column("jobs", sa.Column("external_id", sa.String(), nullable=True))
+
+        if op.get_bind().dialect.name == "postgresql":
+            url = "r.payload_json->>'url'"
+            ext = "NULLIF(r.payload_json->>'external_id', '')"
+        else:
+            url = "json_extract(r.payload_json, '$.url')"
+            ext = "NULLIF(json_extract(r.payload_json, '$.external_id'), '')"
+        op.execute(f"""
+            UPDATE jobs
+            SET source = (
+                    SELECT r.source FROM raw_jobs r
+                    WHERE {url} = jobs.url ORDER BY r.id LIMIT 1
+                ),
+                external_id = (
+                    SELECT {ext} FROM raw_jobs r
+                    WHERE {url} = jobs.url ORDER BY r.id LIMIT 1
+                )
+            WHERE source IS NULL
+        """)
+
+        # Keep the earliest job per natural key
+        op.execute("""
+            UPDATE jobs
+            SET external_id = NULL
+            WHERE external_id IS NOT NULL
+              AND id NOT IN (
+                SELECT MIN(id) FROM jobs
+                WHERE external_id IS NOT NULL
+                GROUP BY source, external_id
+              )
+        """)
+
+    if not _has_index("jobs", idx):
+        op.create_index(idx, "jobs", ["source", "external_id"], unique=True)
+
+
+def downgrade() -> None:
+    """Remove source/external_id columns (idempotent)."""
+    idx = "uq_jobs_source_external_id"
+
+    if _has_index("jobs", idx):
+        op.drop_index(idx, table_name="jobs")
+    if _has_column("jobs", "external_id"):
+        op.drop_column("jobs", "external_id")
+    if _has_column("jobs", "source"):
+        op.drop_column("jobs", "source")
@@ -0,0 +1,73 @@
+"""add_raw_jobs_processed_at
+
+Revision ID: 9d4b6a2e5c13
+Revises: 3c8e1f0a9b72
+Create Date: 2026-10-15 21:04:18.533907
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4b6a2e5c13"
+down_revision: str | Sequence[str] | None = "3c8e1f0a9b72"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _has_column(table: str, column: str) -> bool:
+    """Check if a column exists in a table."""
+    bind = op.get_bind()
+    insp = inspect(bind)
+    cols = [c["name"] for c in insp.get_columns(table)]
+    return column in cols
+
+
+def _has_index(table: str, index: str) -> bool:
+    """Check if an index exists on a table."""
+    bind = op.get_bind()
+    insp = inspect(bind)
+    indexes = [idx["name"] for idx in insp.get_indexes(table)]
+    return index in indexes
+
+
+_PENDING = sa.text("processed_at IS NULL")
+
+
+def upgrade() -> None:
+    """Add raw_jobs.processed_at, a partial index on pending rows and a (source, ingested_at) index.
+
+    Existing rows are left with processed_at NULL, so the first transform after
+    upgrading re-reads them once (deduped against jobs as before) and marks them.
+    """
+    if not _has_column("raw_jobs", "processed_at"):
+        op.add_column(
+            "raw_jobs", sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True)
+        )
+
+    if not _has_index("raw_jobs", "idx_raw_jobs_pending"):
+        op.create_index(
+            "idx_raw_jobs_pending",
+            "raw_jobs",
+            ["id"],
+            postgresql_where=_PENDING,
+            sqlite_where=_PENDING,
+        )
+
+    if not _has_index("raw_jobs", "idx_raw_jobs_source_ingested"):
+        op.create_index("idx_raw_jobs_source_ingested", "raw_jobs", ["source", "ingested_at"])
+
+
+def downgrade() -> None:
+    """Remove processed_at column and its indexes (idempotent)."""
+    if _has_index("raw_jobs", "idx_raw_jobs_pending"):
+        op.drop_index("idx_raw_jobs_pending", table_name="raw_jobs")
+    if _has_index("raw_jobs", "idx_raw_jobs_source_ingested"):
+        op.drop_index("idx_raw_jobs_source_ingested", table_name="raw_jobs")
+    if _has_column("raw_jobs", "processed_at"):
+        op.drop_column("raw_jobs", "processed_at")
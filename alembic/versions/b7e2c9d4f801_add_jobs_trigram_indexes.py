@@ -0,0 +1,61 @@
+"""add_jobs_trigram_indexes
+
+Revision ID: b7e2c9d4f801
+Revises: 9d4b6a2e5c13
+Create Date: 2026-10-15 21:31:52.074416
+
+"""
+
+from collections.abc import Sequence
+
+from sqlalchemy import inspect
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e2c9d4f801"
+down_revision: str | Sequence[str] | None = "9d4b6a2e5c13"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRGM_COLUMNS = ("title", "company", "location")
+
+
+def _has_index(table: str, index: str) -> bool:
+    """Check if an index exists on a table."""
+    bind = op.get_bind()
+    insp = inspect(bind)
+    indexes = [idx["name"] for idx in insp.get_indexes(table)]
+    return index in indexes
+
+
+def upgrade() -> None:
+    """Add pg_trgm GIN indexes backing the ILIKE '%term%' search filters.
+
+    Postgres only: SQLite has no trigram support and its test databases are small.
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for col in TRGM_COLUMNS:
+        idx = f"idx_jobs_{col}_trgm"
+        if not _has_index("jobs", idx):
+            op.create_index(
+                idx,
+                "jobs",
+                [col],
+                postgresql_using="gin",
+                postgresql_ops={col: "gin_trgm_ops"},
+            )
+
+
+def downgrade() -> None:
+    """Remove trigram indexes (idempotent). The pg_trgm extension is left installed."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for col in TRGM_COLUMNS:
+        idx = f"idx_jobs_{col}_trgm"
+        if _has_index("jobs", idx):
+            op.drop_index(idx, table_name="jobs")
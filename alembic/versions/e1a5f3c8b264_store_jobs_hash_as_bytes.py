@@ -0,0 +1,81 @@
+"""store_jobs_hash_as_bytes
+
+Revision ID: e1a5f3c8b264
+Revises: b7e2c9d4f801
+Create Date: 2026-10-15 21:58:07.611930
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1a5f3c8b264"
+down_revision: str | Sequence[str] | None = "b7e2c9d4f801"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _hash_is_binary() -> bool:
+    """Check if jobs.hash has already been converted to a binary type."""
+    bind = op.get_bind()
+    insp = inspect(bind)
+    col = next(c for c in insp.get_columns("jobs") if c["name"] == "hash")
+    return isinstance(col["type"], sa.LargeBinary)
+
+
+def upgrade() -> None:
+    """Convert jobs.hash from hex text to the raw 16-byte digest.
+
+    Older rows hold 64-char (full SHA-256) or 32-char hex; the first 32 hex
+    chars of either decode to the same 16 bytes job_hash() now produces.
+    """
+    if _hash_is_binary():
+        return
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("""
+            ALTER TABLE jobs
+            ALTER COLUMN hash TYPE BYTEA
+            USING decode(left(hash, 32), 'hex')
+        """)
+        return
+
+    # SQLite: no hex decoding in SQL on older versions, so convert in Python
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, hash FROM jobs WHERE hash IS NOT NULL")).all()
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.alter_column("hash", type_=sa.LargeBinary(16), existing_nullable=True)
+    if rows:
+        bind.execute(
+            sa.text("UPDATE jobs SET hash = :hash WHERE id = :id"),
+            [{"id": row_id, "hash": bytes.fromhex(h[:32])} for row_id, h in rows],
+        )
+
+
+def downgrade() -> None:
+    """Convert jobs.hash back to hex text (32 chars)."""
+    if not _hash_is_binary():
+        return
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("""
+            ALTER TABLE jobs
+            ALTER COLUMN hash TYPE VARCHAR
+            USING encode(hash, 'hex')
+        """)
+        return
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, hash FROM jobs WHERE hash IS NOT NULL")).all()
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.alter_column("hash", type_=sa.String(), existing_nullable=True)
+    if rows:
+        bind.execute(
+            sa.text("UPDATE jobs SET hash = :hash WHERE id = :id"),
+            [{"id": row_id, "hash": bytes(h).hex()} for row_id, h in rows],
+        )
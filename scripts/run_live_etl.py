@@ -4,7 +4,7 @@ import argparse
 
 from jobintel.analytics.top_skills import top_skills
 from jobintel.db import SessionLocal, init_db
-from jobintel.etl.pipeline import run_ingest
+from jobintel.etl.pipeline import run_ingest_multi
 
 
 def main() -> None:
@@ -31,14 +31,15 @@ def main() -> None:
     )
 
     with SessionLocal() as session:
-        for source in sources:
-            print(f"\n🔄 Running ingestion for {source}...")
-            result = run_ingest(
-                session,
-                source_name=source,
-                search=args.search or "",
-                limit=args.limit,
-            )
+        # Sources are fetched concurrently; ETL still runs one source at a time
+        print(f"\n🔄 Running ingestion for {', '.join(sources)}...")
+        results = run_ingest_multi(
+            session,
+            source_names=sources,
+            search=args.search or "",
+            limit=args.limit,
+        )
+        for source, result in zip(sources, results, strict=True):
             print(
                 f"✅ {source}: fetched={result.fetched} "
                 f"inserted_raw={result.inserted_raw} "
@@ -7,9 +7,9 @@ Queries filter by production environment by default to exclude test data.
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta
-from typing import Literal
+from typing import Literal, NamedTuple
 
-from sqlalchemy import Integer, cast, distinct, func, select, text
+from sqlalchemy import Integer, cast, distinct, exists, func, select, text
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import expression
 
@@ -22,6 +22,14 @@ PRODUCTION_ENV = "production"
 Bucket = Literal["6h", "day", "week"]
 
 
+class TrendRow(NamedTuple):
+    """One (time bucket, skill) point from get_skill_trends."""
+
+    bucket: str
+    skill: str
+    count: int
+
+
 def bucket_expr(
     ts_col: expression.ColumnElement,
     bucket: Bucket,
@@ -107,9 +115,13 @@ def get_kpis(
     date_to: date | None = None,
     search: str | None = None,
     environment: str = PRODUCTION_ENV,
+    today: date | None = None,
 ) -> dict:
     """Get key performance indicators for the dashboard.
 
+    The 7-day window ends at `today` (defaults to date.today()); pass it to get
+    results that don't depend on the wall clock.
+
     Returns:
         dict with keys: total_jobs, jobs_last_7d, unique_companies, sources_count
     """
@@ -118,7 +130,7 @@ def get_kpis(
     total_jobs = base_q.count()
 
     # Jobs in last 7 days (ignoring other date filters for this metric)
-    seven_days_ago = date.today() - timedelta(days=7)
+    seven_days_ago = (today or date.today()) - timedelta(days=7)
     jobs_7d_q = _base_job_query(session, source, seven_days_ago, None, search, environment)
     jobs_last_7d = jobs_7d_q.count()
 
@@ -161,21 +173,20 @@ def get_top_skills(
 ) -> list[tuple[str, int]]:
     """Get top skills by number of distinct jobs mentioning them.
 
-    Uses COUNT(DISTINCT job_id) to avoid over-counting from duplicates.
+    Environment/source filters are applied as an EXISTS semi-join on raw_jobs,
+    so a job with several raw rows still appears once and a plain COUNT(*) per
+    skill is exact; (job_id, skill) is the job_skills primary key. This avoids
+    the per-group sort/hash that COUNT(DISTINCT job_id) needs.
     """
     url_expr = RawJob.payload_json["url"].as_string()
 
-    q = (
-        session.query(JobSkill.skill, func.count(distinct(JobSkill.job_id)).label("n"))
-        .join(Job, Job.id == JobSkill.job_id)
-        .join(RawJob, url_expr == Job.url)  # Inner join for environment filtering
-    )
-
-    # Environment filter
-    q = q.filter(RawJob.environment == environment)
-
+    # Environment filter (and optional source) on any raw row for the job
+    raw_match = exists().where(url_expr == Job.url, RawJob.environment == environment)
     if source:
-        q = q.filter(RawJob.source == source)
+        raw_match = raw_match.where(RawJob.source == source)
+
+    n = func.count().label("n")
+    q = session.query(JobSkill.skill, n).join(Job, Job.id == JobSkill.job_id).filter(raw_match)
 
     if date_from:
         q = q.filter(Job.posted_at >= date_from)
@@ -187,11 +198,7 @@ def get_top_skills(
         like = f"%{search}%"
         q = q.filter(Job.title.ilike(like) | Job.company.ilike(like) | Job.location.ilike(like))
 
-    q = (
-        q.group_by(JobSkill.skill)
-        .order_by(func.count(distinct(JobSkill.job_id)).desc())
-        .limit(limit)
-    )
+    q = q.group_by(JobSkill.skill).order_by(n.desc()).limit(limit)
 
     return [(skill, int(n)) for skill, n in q.all()]
 
@@ -204,7 +211,7 @@ def get_skill_trends(
     date_to: date | None = None,
     granularity: Bucket | None = None,
     environment: str = PRODUCTION_ENV,
-) -> list[dict]:
+) -> list[TrendRow]:
     """Get skill counts over time, bucketed by granularity.
 
     Args:
@@ -217,8 +224,9 @@ def get_skill_trends(
         environment: Environment filter (default: production)
 
     Returns:
-        List of dicts: [{"bucket": str, "skill": str, "count": int}, ...]
-        Bucket is a timestamp string for charting.
+        List of TrendRow(bucket, skill, count) tuples.
+        Bucket is a timestamp string for charting; pd.DataFrame(rows) takes the
+        field names as columns.
     """
     if not skills:
         return []
@@ -271,15 +279,8 @@ def get_skill_trends(
 
     rows = q.all()
 
-    # Convert to list of dicts
-    result = []
-    for bucket, skill, count in rows:
-        # Convert bucket to string for consistent output
-        bucket_str = str(bucket) if bucket else None
-        if bucket_str:
-            result.append({"bucket": bucket_str, "skill": skill, "count": int(count)})
-
-    return result
+    # Convert bucket to string for consistent output
+    return [TrendRow(str(bucket), skill, int(count)) for bucket, skill, count in rows if bucket]
 
 
 def get_top_skills_by_source(
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import sys
 from enum import StrEnum
 from pathlib import Path
 from typing import Literal
@@ -14,7 +15,8 @@ if os.name == "nt":
 
 # Compute absolute path to .env so Streamlit finds it regardless of cwd
 # Path: config.py -> core/ -> jobintel/ -> src/ -> PROJECT_ROOT
-PROJECT_ROOT = Path(__file__).resolve().parents[3]
+# (module __file__ is already absolute; skip resolve() and its stat() calls)
+PROJECT_ROOT = Path(__file__).parents[3]
 ENV_FILE = PROJECT_ROOT / ".env"
 
 
@@ -48,6 +50,9 @@ class Settings(BaseSettings):
 
 def _load_streamlit_secrets() -> None:
     """Copy Streamlit Cloud secrets to os.environ before pydantic reads them."""
+    # CLI entrypoints never run under Streamlit; skip the (slow) streamlit import there.
+    if "streamlit" not in sys.modules and "STREAMLIT_SERVER_PORT" not in os.environ:
+        return
     try:
         import streamlit as st
 
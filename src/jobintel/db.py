@@ -1,29 +1,39 @@
 from __future__ import annotations
 
+from functools import cache
 from typing import Any
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from jobintel.core.config import settings
+from jobintel.core.config import PROJECT_ROOT, settings
 
+# The database URL is fixed for the life of the process, so check the dialect once.
+_IS_SQLITE = settings.DATABASE_URL.startswith("sqlite")
+_IS_POSTGRES = settings.DATABASE_URL.startswith("postgres")
 
-def _connect_args(url: str) -> dict[str, Any]:
-    # SQLite needs this, Postgres must NOT receive it
-    if url.startswith("sqlite"):
-        return {"check_same_thread": False}
-    return {}
+# SQLite needs this, Postgres must NOT receive it
+_CONNECT_ARGS: dict[str, Any] = {"check_same_thread": False} if _IS_SQLITE else {}
 
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args=_connect_args(settings.DATABASE_URL),
-    pool_pre_ping=True,
-)
+def _engine_kwargs() -> dict[str, Any]:
+    kwargs: dict[str, Any] = {"connect_args": _CONNECT_ARGS, "pool_pre_ping": True}
+    if _IS_POSTGRES:
+        # Streamlit sessions and ETL share this pool; the default size (5) serializes them.
+        # LIFO keeps the most recently used connections hot, recycle drops stale ones.
+        kwargs.update(pool_size=10, max_overflow=20, pool_recycle=1800, pool_use_lifo=True)
+    return kwargs
+
+
+engine = create_engine(settings.DATABASE_URL, **_engine_kwargs())
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 
+# Schema setup is done once per process: Streamlit re-runs the dashboard script on every
+# interaction, and create_all() re-inspects every table each time. A failed attempt
+# raises and so is not cached.
+@cache
 def init_db(skip_migrations: bool = False) -> None:
     """Initialize database schema.
 
@@ -34,7 +44,8 @@ def init_db(skip_migrations: bool = False) -> None:
     For production (with migrations): Runs Alembic migrations (alembic upgrade head).
     For development/testing/skip: Uses SQLAlchemy create_all() for quick setup.
 
-    This function is safe to call multiple times.
+    This function is safe to call multiple times; repeat calls with the same
+    arguments are no-ops for the life of the process.
     """
     from jobintel.models import Base
 
@@ -42,13 +53,12 @@ def init_db(skip_migrations: bool = False) -> None:
         # Production: use Alembic migrations for safe, versioned schema changes
         try:
             import os
-            from pathlib import Path
 
             from alembic.config import Config
 
             from alembic import command
 
-            project_root = Path(__file__).resolve().parents[2]
+            project_root = PROJECT_ROOT
             alembic_ini = project_root / "alembic.ini"
 
             if not alembic_ini.exists():
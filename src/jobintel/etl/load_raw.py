@@ -21,7 +21,7 @@ def load_raw_jobs(
         jsonl_path: Path to JSONL file with job payloads
         environment: Environment tag (uses settings.ENV if None)
 
-    Idempotent: reruns will skip jobs already seen (via content_hash, plus URL when present).
+    Idempotent: reruns will skip jobs already seen (via the raw_jobs.content_hash column).
     """
     env = environment or settings.ENV
     path = Path(jsonl_path)
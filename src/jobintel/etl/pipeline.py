@@ -6,17 +6,20 @@ Keeps pipeline behavior consistent across all entrypoints.
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 
+from sqlalchemy import exists, select, update
 from sqlalchemy.orm import Session
 
 from jobintel.core.config import settings
-from jobintel.etl.raw import upsert_raw_job
+from jobintel.etl.raw import upsert_raw_jobs_bulk
 from jobintel.etl.skills import extract_skills_for_all_jobs
 from jobintel.etl.sources.registry import fetch_from_source
-from jobintel.etl.transform import transform_jobs
-from jobintel.models import IngestRun
+from jobintel.etl.transform import transform_jobs, transform_new_jobs
+from jobintel.models import IngestRun, Job, RawJob
 
 
 @dataclass
@@ -47,9 +50,9 @@ def run_etl_from_payloads(
     """Run ETL pipeline on a list of raw payloads.
 
     Steps:
-        1. Upsert each payload into raw_jobs (idempotent)
-        2. Transform raw_jobs into normalized jobs
-        3. Extract skills from jobs into job_skills
+        1. Bulk-upsert payloads into raw_jobs (idempotent)
+        2. Transform raw_jobs into normalized jobs (skipped if nothing is pending)
+        3. Extract skills into job_skills for every job still pending extraction
 
     Args:
         session: SQLAlchemy session (ETL functions handle commits internally)
@@ -60,21 +63,32 @@ def run_etl_from_payloads(
         EtlResult with counts of inserted records
     """
     env = environment or settings.ENV
-    inserted_raw = 0
-    for payload in payloads:
-        if upsert_raw_job(session, payload, environment=env):
-            inserted_raw += 1
+    inserted_raw = upsert_raw_jobs_bulk(session, payloads, environment=env)
 
-    inserted_jobs = transform_jobs(session)
+    # All duplicates (common on scheduled re-ingest): skip unless an earlier failed run
+    # left raw rows untransformed or jobs without skills
+    if inserted_raw == 0 and not _has_pending_work(session):
+        session.commit()
+        return EtlResult()
+
+    new_jobs = transform_new_jobs(session)
+    # Pending jobs, not just new_jobs: also picks up any left by an earlier failed run
     inserted_skills = extract_skills_for_all_jobs(session)
 
     return EtlResult(
         inserted_raw=inserted_raw,
-        inserted_jobs=inserted_jobs,
+        inserted_jobs=len(new_jobs),
         inserted_skills=inserted_skills,
     )
 
 
+def _has_pending_work(session: Session) -> bool:
+    """Whether any raw row awaits transform or any job awaits skills extraction."""
+    pending_raw = exists().where(RawJob.processed_at.is_(None))
+    pending_skills = exists().where(Job.skills_extracted_at.is_(None))
+    return bool(session.scalar(select(pending_raw | pending_skills)))
+
+
 def run_ingest(
     session: Session,
     source_name: str,
@@ -101,8 +115,60 @@ def run_ingest(
         IngestResult with counts and any validation warnings
     """
     env = environment or settings.ENV
+    run = _start_run(session, source_name, search, limit, env)
+    return _complete_run(session, run, lambda: fetch_from_source(source_name, search, limit), env)
+
+
+def run_ingest_multi(
+    session: Session,
+    source_names: list[str],
+    search: str,
+    limit: int,
+    environment: str | None = None,
+) -> list[IngestResult]:
+    """Run the ingest pipeline for several sources, fetching them concurrently.
+
+    Fetching is HTTP-bound, so all sources are fetched on a thread pool and
+    wall-clock time is roughly the slowest source rather than the sum. ETL then
+    runs one source at a time in the caller's session: transform and skills
+    sweep shared tables, and SQLAlchemy sessions are not thread-safe.
+
+    Each source gets its own IngestRun. A failing source is recorded as failed
+    without stopping the others; the first error is re-raised once all finish.
+
+    Args:
+        session: SQLAlchemy session (ETL functions handle commits internally)
+        source_names: Names of the sources to fetch from
+        search: Search query string
+        limit: Maximum number of jobs to fetch per source
+        environment: Environment tag (uses settings.ENV if None)
+
+    Returns:
+        IngestResult per source, in the order of source_names
+    """
+    if not source_names:
+        return []
+
+    env = environment or settings.ENV
+    runs = [_start_run(session, name, search, limit, env) for name in source_names]
+
+    results: list[IngestResult] = []
+    first_error: Exception | None = None
+    with ThreadPoolExecutor(max_workers=min(8, len(source_names))) as executor:
+        futures = [executor.submit(fetch_from_source, name, search, limit) for name in source_names]
+        for run, future in zip(runs, futures, strict=True):
+            try:
+                results.append(_complete_run(session, run, future.result, env))
+            except Exception as e:
+                first_error = first_error or e
 
-    # Create ingest run record at start
+    if first_error is not None:
+        raise first_error
+    return results
+
+
+def _start_run(session: Session, source_name: str, search: str, limit: int, env: str) -> IngestRun:
+    """Create the IngestRun record (status='running') for a source."""
     run = IngestRun(
         source=source_name,
         search=search if search else None,
@@ -113,10 +179,19 @@ def run_ingest(
     )
     session.add(run)
     session.commit()
+    return run
 
+
+def _complete_run(
+    session: Session,
+    run: IngestRun,
+    fetch: Callable[[], tuple[list[dict], list[str]]],
+    env: str,
+) -> IngestResult:
+    """Fetch payloads, run ETL on them, and record the outcome on the run."""
     try:
         # Fetch from source
-        payloads, warnings = fetch_from_source(source_name, search, limit)
+        payloads, warnings = fetch()
 
         # Run ETL on fetched payloads
         etl_result = run_etl_from_payloads(session, payloads, environment=env)
@@ -139,6 +214,10 @@ def run_ingest(
             warnings=warnings,
         )
     except Exception as e:
+        # A DB error leaves the session unusable until rolled back; the run row itself
+        # was committed by _start_run, so it survives and is reloaded on next access.
+        session.rollback()
+
         # Update run with failure
         run.status = "failed"
         run.finished_at = datetime.now(UTC)
@@ -147,17 +226,24 @@ def run_ingest(
         raise
 
 
-def run_postprocess(session: Session) -> tuple[int, int]:
+def run_postprocess(session: Session, reprocess: bool = False) -> tuple[int, int]:
     """Run transform and skills extraction only (no fetch/raw upsert).
 
-    Useful for reprocessing existing raw_jobs data.
+    By default this picks up pending work only: raw_jobs not yet transformed and
+    jobs whose skills were not yet extracted (e.g. left behind by a failed run).
 
     Args:
         session: SQLAlchemy session (transform and skills functions commit internally)
+        reprocess: If True, clear raw_jobs.processed_at and rescan every job's skills,
+                   re-reading all existing data. Rows already in jobs/job_skills are
+                   still skipped, so this only fills gaps.
 
     Returns:
         Tuple of (inserted_jobs, inserted_skills)
     """
+    if reprocess:
+        session.execute(update(RawJob).values(processed_at=None))
+        session.commit()
     inserted_jobs = transform_jobs(session)
-    inserted_skills = extract_skills_for_all_jobs(session)
+    inserted_skills = extract_skills_for_all_jobs(session, rescan=reprocess)
     return inserted_jobs, inserted_skills
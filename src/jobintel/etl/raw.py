@@ -5,6 +5,8 @@ import json
 from typing import Any
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from jobintel.core.config import settings
@@ -40,17 +42,12 @@ def upsert_raw_job(
     Returns True if inserted, False if it already existed.
     """
     env = environment or settings.ENV
-    payload = dict(payload)  # do not mutate caller
-    payload.setdefault("content_hash", compute_content_hash(payload))
+    # Always the full payload hash (URL included), never a source-supplied
+    # content_hash; see upsert_raw_jobs_bulk.
+    content_hash = compute_content_hash(payload)
 
-    url = payload.get("url")
-    content_hash = payload.get("content_hash")
-
-    stmt = select(RawJob.id).where(RawJob.payload_json["content_hash"].as_string() == content_hash)
-    if url:
-        stmt = stmt.where(RawJob.payload_json["url"].as_string() == url)
-
-    exists = session.execute(stmt).first()
+    # Index seek on the unique content_hash column (no JSON-path scan)
+    exists = session.execute(select(RawJob.id).where(RawJob.content_hash == content_hash)).first()
     if exists:
         return False
 
@@ -58,8 +55,50 @@ def upsert_raw_job(
         RawJob(
             source=payload.get("source", "unknown"),
             payload_json=payload,
+            content_hash=content_hash,
             environment=env,
         )
     )
     session.flush()
     return True
+
+
+def upsert_raw_jobs_bulk(
+    session: Session, payloads: list[dict[str, Any]], environment: str | None = None
+) -> int:
+    """Insert a batch of raw jobs in one statement, skipping ones already seen.
+
+    Dedup is delegated to the unique index on raw_jobs.content_hash via
+    ON CONFLICT DO NOTHING. The column always holds compute_content_hash(payload),
+    never a source-supplied content_hash: those can leave out the URL (Arbeitnow
+    hashes title|company|description), which would merge distinct listings.
+    Payloads are stored unchanged (the caller's dicts are never copied or mutated).
+
+    Args:
+        session: SQLAlchemy session
+        payloads: Raw job payload dicts
+        environment: Environment tag (uses settings.ENV if None)
+
+    Returns the number of rows actually inserted.
+    """
+    if not payloads:
+        return 0
+
+    env = environment or settings.ENV
+    rows = [
+        {
+            "source": payload.get("source", "unknown"),
+            "payload_json": payload,
+            "content_hash": compute_content_hash(payload),
+            "environment": env,
+        }
+        for payload in payloads
+    ]
+
+    insert = pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = (
+        insert(RawJob)
+        .on_conflict_do_nothing(index_elements=[RawJob.content_hash])
+        .returning(RawJob.id)
+    )
+    return len(session.execute(stmt, rows).all())
@@ -1,57 +1,138 @@
 from __future__ import annotations
 
+import hashlib
 import re
+import threading
+from collections import OrderedDict
 from collections.abc import Iterable
+from datetime import UTC, datetime
 
-from sqlalchemy import select
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
 from jobintel.models import Job, JobSkill
 
-_SKILL_PATTERNS: dict[str, str] = {
-    "python": r"\bpython\b",
-    "sql": r"\bsql\b",
-    "pandas": r"\bpandas\b",
-    "aws": r"\baws\b|\bamazon web services\b",
-    "fastapi": r"\bfastapi\b",
-    "postgres": r"\bpostgres(?:ql)?\b",
-    "docker": r"\bdocker\b",
-    "scikit-learn": r"\bscikit[- ]learn\b|\bsklearn\b",
-    "pytest": r"\bpytest\b",
-    "ci": r"\bci\b|\bcontinuous integration\b",
+# Surface forms per skill, matched case-insensitively on word boundaries.
+_SKILL_SURFACES: dict[str, tuple[str, ...]] = {
+    "python": ("python",),
+    "sql": ("sql",),
+    "pandas": ("pandas",),
+    "aws": ("aws", "amazon web services"),
+    "fastapi": ("fastapi",),
+    "postgres": ("postgres", "postgresql"),
+    "docker": ("docker",),
+    "scikit-learn": ("scikit-learn", "scikit learn", "sklearn"),
+    "pytest": ("pytest",),
+    "ci": ("ci", "continuous integration"),
 }
 
+_WORD_RE = re.compile(r"\w+")
+
+
+def _build_matchers() -> tuple[dict[str, str], list[tuple[str, re.Pattern[str]]]]:
+    """Split surfaces into single words (set lookup) and phrases (word-bounded regex)."""
+    words: dict[str, str] = {}
+    phrases: list[tuple[str, re.Pattern[str]]] = []
+    for skill, surfaces in _SKILL_SURFACES.items():
+        for surface in surfaces:
+            if _WORD_RE.fullmatch(surface):
+                words[surface] = skill
+            else:
+                phrases.append((skill, re.compile(rf"\b{re.escape(surface)}\b")))
+    return words, phrases
+
+
+_WORD_SKILLS, _PHRASE_PATTERNS = _build_matchers()
+
+
+# LRU memo of description digest -> skills. Keyed on a 16-byte digest rather than the
+# text so the long-lived dashboard process never pins whole descriptions in memory.
+_CACHE_SIZE = 4096
+_cache: OrderedDict[bytes, frozenset[str]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _extract_skills_cached(text: str) -> frozenset[str]:
+    key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    with _cache_lock:
+        found = _cache.get(key)
+        if found is not None:
+            _cache.move_to_end(key)
+            return found
+
+    found = _scan_skills(text)
+    with _cache_lock:
+        _cache[key] = found
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return found
+
+
+def _scan_skills(text: str) -> frozenset[str]:
+    t = text.lower()
+    # One tokenizing pass covers every single-word surface, however many skills exist;
+    # only multi-word / punctuated surfaces need their own regex scan.
+    found = {_WORD_SKILLS[w] for w in _WORD_SKILLS.keys() & set(_WORD_RE.findall(t))}
+    for skill, pat in _PHRASE_PATTERNS:
+        if skill not in found and pat.search(t):
+            found.add(skill)
+    return frozenset(found)
+
 
 def extract_skills(text: str | None) -> set[str]:
+    # Reposted / reingested descriptions are common; memoize on a digest of the text.
     if not text:
         return set()
-    t = text.lower()
-    found: set[str] = set()
-    for skill, pat in _SKILL_PATTERNS.items():
-        if re.search(pat, t):
-            found.add(skill)
-    return found
+    return set(_extract_skills_cached(text))
 
 
-def extract_skills_for_jobs(session: Session, jobs: Iterable[Job]) -> int:
-    existing_pairs = set(session.execute(select(JobSkill.job_id, JobSkill.skill)).all())
-
-    inserted = 0
-    for job in jobs:
-        if job.id is None:
-            continue
-        for skill in extract_skills(job.description):
-            key = (job.id, skill)
+def extract_skills_for_rows(session: Session, rows: Iterable[tuple[int, str | None]]) -> int:
+    """Extract skills for (job_id, description) rows. Returns number of skills inserted."""
+    rows = [(job_id, description) for job_id, description in rows if job_id is not None]
+    if not rows:
+        return 0
+
+    # Only load existing pairs for the id range being processed
+    ids = [job_id for job_id, _ in rows]
+    existing_pairs = set(
+        session.execute(
+            select(JobSkill.job_id, JobSkill.skill).where(
+                JobSkill.job_id.between(min(ids), max(ids))
+            )
+        ).all()
+    )
+
+    new_rows: list[dict[str, int | str]] = []
+    for job_id, description in rows:
+        for skill in extract_skills(description):
+            key = (job_id, skill)
             if key in existing_pairs:
                 continue
-            session.add(JobSkill(job_id=job.id, skill=skill))
+            new_rows.append({"job_id": job_id, "skill": skill})
             existing_pairs.add(key)
-            inserted += 1
 
+    # One executemany rather than a unit-of-work INSERT per JobSkill object
+    if new_rows:
+        session.execute(insert(JobSkill), new_rows)
+    # Marked in the same commit as the skills, so a failed run leaves the jobs pending
+    now = datetime.now(UTC)
+    session.execute(update(Job), [{"id": job_id, "skills_extracted_at": now} for job_id in ids])
     session.commit()
-    return inserted
+    return len(new_rows)
+
+
+def extract_skills_for_jobs(session: Session, jobs: Iterable[Job]) -> int:
+    return extract_skills_for_rows(session, ((job.id, job.description) for job in jobs))
+
 
+def extract_skills_for_all_jobs(session: Session, rescan: bool = False) -> int:
+    """Extract skills for jobs not yet processed. Returns number of skills inserted.
 
-def extract_skills_for_all_jobs(session: Session) -> int:
-    jobs = session.execute(select(Job)).scalars().all()
-    return extract_skills_for_jobs(session, jobs)
+    Only jobs whose skills_extracted_at is NULL are read (a partial-index scan),
+    including ones left pending by an earlier run that failed mid-way. Pass
+    rescan=True to re-read every job (e.g. after adding a skill surface).
+    """
+    q = select(Job.id, Job.description)
+    if not rescan:
+        q = q.where(Job.skills_extracted_at.is_(None))
+    return extract_skills_for_rows(session, session.execute(q.order_by(Job.id)).all())
@@ -11,63 +11,70 @@ from __future__ import annotations
 import hashlib
 import logging
 import time
+from collections.abc import Mapping
 from datetime import UTC, datetime
 from typing import Any
 
 import requests
 
+from jobintel.etl.sources.base import build_search_matcher
+from jobintel.etl.sources.http import create_session
 from jobintel.etl.sources.registry import register_source
 
 logger = logging.getLogger(__name__)
 
 ARBEITNOW_API_URL = "https://arbeitnow.com/api/job-board-api"
-# Rate limit: wait between API requests to avoid 429 errors
+# Rate limit: wait between API requests to avoid 429 errors when the API doesn't
+# tell us how much quota is left (see _page_delay)
 REQUEST_DELAY_SECONDS = 2.5
-# Retry settings for 429 rate limit errors
-MAX_RETRIES = 3
-RETRY_BACKOFF_SECONDS = 5.0
 
+_SESSION = create_session()
 
-def _fetch_page_with_retry(page: int) -> dict[str, Any] | None:
-    """Fetch a single page from Arbeitnow API with retry on 429.
 
-    Returns the JSON response dict, or None if all retries failed.
+def _page_delay(headers: Mapping[str, str]) -> float:
+    """Seconds to wait before requesting the next page.
+
+    Uses X-RateLimit-Remaining when the API sends it: no wait while quota is
+    left, the default delay once it is used up. Falls back to the default delay
+    when the header is missing or malformed. A 429 that slips through is retried
+    by the session, honouring Retry-After.
     """
-    for attempt in range(MAX_RETRIES):
-        try:
-            resp = requests.get(
-                ARBEITNOW_API_URL,
-                params={"page": page},
-                timeout=30,
-            )
-            if resp.status_code == 429:
-                wait_time = RETRY_BACKOFF_SECONDS * (attempt + 1)
-                logger.warning(
-                    "Arbeitnow rate limited (429) on page %d, retry %d/%d in %.1fs",
-                    page,
-                    attempt + 1,
-                    MAX_RETRIES,
-                    wait_time,
-                )
-                time.sleep(wait_time)
-                continue
-            resp.raise_for_status()
-            return resp.json()
-        except requests.RequestException as e:
-            logger.warning("Arbeitnow API request failed on page %d: %s", page, e)
-            return None
-        except ValueError as e:
-            logger.warning("Arbeitnow API returned invalid JSON on page %d: %s", page, e)
-            return None
-    logger.warning("Arbeitnow API exhausted retries on page %d", page)
-    return None
+    try:
+        remaining = int(headers["X-RateLimit-Remaining"])
+    except (KeyError, TypeError, ValueError):
+        return REQUEST_DELAY_SECONDS
+    return 0.0 if remaining > 0 else REQUEST_DELAY_SECONDS
+
+
+def _fetch_page(page: int) -> tuple[dict[str, Any] | None, float]:
+    """Fetch a single page from Arbeitnow API.
+
+    Rate limiting (429) and transient 5xx errors are retried by the session.
+    Returns the JSON response dict (None if the request failed) and the delay
+    to observe before the next page.
+    """
+    try:
+        resp = _SESSION.get(
+            ARBEITNOW_API_URL,
+            params={"page": page},
+            timeout=30,
+        )
+        resp.raise_for_status()
+        return resp.json(), _page_delay(resp.headers)
+    except requests.RequestException as e:
+        logger.warning("Arbeitnow API request failed on page %d: %s", page, e)
+        return None, REQUEST_DELAY_SECONDS
+    except ValueError as e:
+        logger.warning("Arbeitnow API returned invalid JSON on page %d: %s", page, e)
+        return None, REQUEST_DELAY_SECONDS
 
 
 def fetch_arbeitnow_jobs(search: str | None = None, limit: int = 100) -> list[dict[str, Any]]:
     """Fetch jobs from Arbeitnow API and normalize to canonical payload format.
 
     Args:
-        search: Optional search filter (applied client-side).
+        search: Optional search filter (applied client-side); comma-separated
+            terms match any of them.
         limit: Maximum number of jobs to return.
 
     Returns:
@@ -76,9 +83,12 @@ def fetch_arbeitnow_jobs(search: str | None = None, limit: int = 100) -> list[di
     payloads: list[dict[str, Any]] = []
     page = 1
     max_pages = 10  # Safety limit to prevent infinite loops
+    matches = build_search_matcher(search)
+    # Listings shift between page requests, so a job can show up on two pages
+    seen_ids: set[str] = set()
 
     while page <= max_pages and len(payloads) < limit:
-        data = _fetch_page_with_retry(page)
+        data, delay = _fetch_page(page)
         if data is None:
             break
 
@@ -90,30 +100,36 @@ def fetch_arbeitnow_jobs(search: str | None = None, limit: int = 100) -> list[di
             if len(payloads) >= limit:
                 break
 
-            payload = _normalize_job(job)
-            if not payload:
+            job_id = job.get("slug") or job.get("url")
+            if job_id in seen_ids:
                 continue
 
-            # Apply search filter client-side (API doesn't support search param well)
-            if search:
-                search_lower = search.lower()
-                title = payload["title"]
-                company = payload.get("company", "")
-                description = payload.get("description", "")
+            # Apply search filter client-side (API doesn't support search param well).
+            # Filter on the raw fields so non-matching jobs are never normalized.
+            if matches is not None:
+                title = job.get("title")
+                company = job.get("company_name")
+                description = job.get("description", "")
                 searchable = f"{title} {company} {description}".lower()
-                if search_lower not in searchable:
+                if not matches(searchable):
                     continue
 
+            payload = _normalize_job(job)
+            if not payload:
+                continue
+            seen_ids.add(job_id)
+
             payloads.append(payload)
 
-        # Check for next page
+        # Check for next page; don't pay the rate-limit delay if we already have enough
         links = data.get("links", {})
-        if not links.get("next"):
+        if not links.get("next") or len(payloads) >= limit:
             break
 
         page += 1
         # Rate limit to avoid 429 errors
-        time.sleep(REQUEST_DELAY_SECONDS)
+        if delay:
+            time.sleep(delay)
 
     logger.info("Fetched %d jobs from Arbeitnow", len(payloads))
     return payloads
@@ -137,7 +153,8 @@ def _normalize_job(job: dict[str, Any]) -> dict[str, Any] | None:
         logger.debug("Skipping job with missing url or title: %s", slug)
         return None
 
-    # Use slug as external_id, fall back to URL hash
+    # Use slug as external_id, fall back to URL hash. Keep the md5 prefix: stored rows
+    # are keyed on it, and changing it would re-key every slug-less job.
     external_id = slug or hashlib.md5(url.encode()).hexdigest()[:16]
 
     # Parse posted_at timestamp (Unix timestamp)
@@ -157,9 +174,15 @@ def _normalize_job(job: dict[str, Any]) -> dict[str, Any] | None:
     job_types = job.get("job_types", []) or []
     all_tags = tags + job_types
 
-    # Generate content hash for deduplication
-    content_for_hash = f"{title}|{job.get('company_name', '')}|{description}"
-    content_hash = hashlib.md5(content_for_hash.encode()).hexdigest()
+    # Generate content hash for deduplication. Feed the parts straight into the
+    # digest rather than building a description-sized "title|company|description"
+    # string first; the result is byte-for-byte the same hash.
+    h = hashlib.md5(str(title).encode())
+    h.update(b"|")
+    h.update(str(job.get("company_name", "")).encode())
+    h.update(b"|")
+    h.update(str(description).encode())
+    content_hash = h.hexdigest()
 
     return {
         "source": "arbeitnow",
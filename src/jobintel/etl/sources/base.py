@@ -1,5 +1,7 @@
 """Base interface and validation for job sources."""
 
+import re
+from collections.abc import Callable
 from typing import Any, Protocol
 
 
@@ -54,10 +56,35 @@ def validate_payloads(
     warnings = []
 
     for i, payload in enumerate(payloads):
-        is_valid, error = validate_payload(payload)
-        if is_valid:
+        # Fast path: nearly every payload is valid, so skip building a missing-keys list
+        if all(map(payload.get, REQUIRED_KEYS)):
             valid.append(payload)
         else:
+            _, error = validate_payload(payload)
             warnings.append(f"[{source_name}] Payload {i}: {error}")
 
     return valid, warnings
+
+
+def build_search_matcher(search: str | None) -> Callable[[str], bool] | None:
+    """Build a predicate for client-side search filtering.
+
+    ``search`` may be a single term or a comma-separated list of terms; a job
+    matches if any term occurs in it. Matching is case-insensitive, so callers
+    pass lowercased text. Returns None when there is nothing to filter on.
+    """
+    if not search:
+        return None
+
+    terms = [t.strip() for t in search.lower().split(",")]
+    terms = list(dict.fromkeys(t for t in terms if t))
+    if not terms:
+        return None
+
+    if len(terms) == 1:
+        term = terms[0]
+        return lambda text: term in text
+
+    # One pass over each description for all terms, instead of one scan per term
+    pattern = re.compile("|".join(re.escape(t) for t in terms))
+    return lambda text: pattern.search(text) is not None
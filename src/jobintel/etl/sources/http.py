@@ -0,0 +1,32 @@
+"""Shared HTTP session factory for job sources."""
+
+from __future__ import annotations
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Retry transient failures and rate limiting; urllib3 honours Retry-After on 429/503
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 1.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def create_session() -> requests.Session:
+    """Create a requests Session with keep-alive pooling and uniform retries.
+
+    Each source module holds one of these at module level so repeated page
+    fetches reuse the same TCP/TLS connection instead of re-handshaking.
+    """
+    retry = Retry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({"GET"}),
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
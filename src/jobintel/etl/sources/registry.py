@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import importlib
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -9,7 +10,14 @@ if TYPE_CHECKING:
 
 # Registry will be populated as sources are imported
 _SOURCES: dict[str, Any] = {}
-_initialized = False
+
+# Built-in sources, imported on first use so a single-source run only loads its own module.
+# Direct module paths avoid a circular dependency through __init__.py.
+_SOURCE_MODULES: dict[str, str] = {
+    "arbeitnow": "jobintel.etl.sources.arbeitnow",
+    "remoteok": "jobintel.etl.sources.remoteok",
+    "remotive": "jobintel.etl.sources.remotive",
+}
 
 
 def register_source(source: JobSource) -> None:
@@ -20,31 +28,18 @@ def register_source(source: JobSource) -> None:
     _SOURCES[name] = source
 
 
-def _init_sources() -> None:
-    """Lazy initialization - import source modules to trigger registration."""
-    global _initialized
-    if _initialized:
-        return
-
-    # Direct module imports to avoid circular dependency through __init__.py
-    from jobintel.etl.sources.arbeitnow import ArbeitnowSource  # noqa: F401
-    from jobintel.etl.sources.remoteok import RemoteOKSource  # noqa: F401
-    from jobintel.etl.sources.remotive import RemotiveSource  # noqa: F401
-
-    _initialized = True
-
-
 def list_sources() -> list[str]:
-    """Get list of available source names."""
-    _init_sources()
-    return sorted(_SOURCES.keys())
+    """Get list of available source names (without importing them)."""
+    return sorted(_SOURCE_MODULES.keys() | _SOURCES.keys())
 
 
 def get_source(name: str) -> JobSource:
-    """Get a source by name."""
-    _init_sources()
+    """Get a source by name, importing its module on first use."""
+    if name not in _SOURCES and name in _SOURCE_MODULES:
+        # Importing the module registers the source
+        importlib.import_module(_SOURCE_MODULES[name])
     if name not in _SOURCES:
-        raise ValueError(f"Unknown source: {name}. Available: {list(_SOURCES.keys())}")
+        raise ValueError(f"Unknown source: {name}. Available: {list_sources()}")
     return _SOURCES[name]
 
 
@@ -57,7 +52,6 @@ def fetch_from_source(
     """
     from jobintel.etl.sources.base import validate_payloads
 
-    _init_sources()
     source = get_source(source_name)
     payloads = source.fetch(search, limit)
     return validate_payloads(payloads, source_name)
@@ -4,13 +4,15 @@ from __future__ import annotations
 
 from typing import Any
 
-import requests
-
 from jobintel.etl.raw import compute_content_hash
+from jobintel.etl.sources.base import build_search_matcher
+from jobintel.etl.sources.http import create_session
 from jobintel.etl.sources.registry import register_source
 
 REMOTEOK_API = "https://remoteok.com/api"
 
+_SESSION = create_session()
+
 
 def fetch_remoteok_jobs(
     search: str | None = None, limit: int = 100, timeout_s: int = 30
@@ -18,17 +20,19 @@ def fetch_remoteok_jobs(
     """Fetch jobs from RemoteOK and normalize to JobIntel format.
 
     RemoteOK API returns jobs with different field names, so we normalize them.
+    ``search`` is applied client-side; comma-separated terms match any of them.
     """
     # RemoteOK API requires user agent
     headers = {"User-Agent": "JobIntel/1.0"}
 
-    resp = requests.get(REMOTEOK_API, headers=headers, timeout=timeout_s)
+    resp = _SESSION.get(REMOTEOK_API, headers=headers, timeout=timeout_s)
     resp.raise_for_status()
     data = resp.json()
 
     # RemoteOK returns list where first item is metadata
     jobs = data[1:] if isinstance(data, list) and len(data) > 1 else []
 
+    matches = build_search_matcher(search)
     payloads: list[dict[str, Any]] = []
     for j in jobs[:limit]:
         # Normalize RemoteOK fields to our standard format
@@ -40,15 +44,14 @@ def fetch_remoteok_jobs(
         posted_at = j.get("date") or j.get("epoch")  # RemoteOK uses epoch timestamp
 
         # Apply search filter client-side (RemoteOK API doesn't support search param)
-        if search:
-            search_lower = search.lower()
+        if matches is not None:
             searchable = f"{title} {company} {description}".lower()
-            if search_lower not in searchable:
+            if not matches(searchable):
                 continue
 
         payload = {
             "source": "remoteok",
-            "external_id": str(j.get("id", "")),
+            "external_id": str(j["id"]) if j.get("id") not in (None, "") else None,
             "url": url,
             "title": title,
             "company": company,
@@ -4,13 +4,16 @@ import html as _html
 import re
 from typing import Any
 
-import requests
-
+from jobintel.etl.sources.http import create_session
 from jobintel.etl.sources.registry import register_source
 
 REMOTIVE_ENDPOINT = "https://remotive.com/api/remote-jobs"
 
-_TAG_RE = re.compile(r"<[^>]+>")
+_SESSION = create_session()
+
+# Excluding "<" from the tag body keeps this linear: a stray "<" (e.g. "salary < 100k")
+# can no longer make every match attempt scan to the end of the description.
+_TAG_RE = re.compile(r"<[^<>]+>")
 
 
 def _strip_html(s: str) -> str:
@@ -34,7 +37,7 @@ def fetch_remotive_jobs(
     if company_name:
         params["company_name"] = company_name
 
-    resp = requests.get(REMOTIVE_ENDPOINT, params=params, timeout=timeout_s)
+    resp = _SESSION.get(REMOTIVE_ENDPOINT, params=params, timeout=timeout_s)
     resp.raise_for_status()
     data = resp.json()
     jobs = data.get("jobs", []) or []
@@ -44,7 +47,7 @@ def fetch_remotive_jobs(
         payloads.append(
             {
                 "source": "remotive",
-                "external_id": str(j.get("id")),
+                "external_id": str(j["id"]) if j.get("id") is not None else None,
                 "url": j.get("url"),
                 "title": j.get("title"),
                 "company": j.get("company_name"),
@@ -2,7 +2,20 @@ from __future__ import annotations
 
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy import (
+    DDL,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    String,
+    Text,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.types import JSON
 
@@ -16,7 +29,16 @@ class RawJob(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     source: Mapped[str] = mapped_column(String, nullable=False)
-    payload_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # JSONB on Postgres: parsed once on write, so ->> lookups (transform's URL
+    # anti-join) don't re-parse the document text on every row
+    payload_json: Mapped[dict] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"), nullable=False
+    )
+    # Dedup key for idempotent ingestion: always jobintel.etl.raw.compute_content_hash,
+    # which covers source, external_id and url (not a source-supplied content_hash)
+    content_hash: Mapped[str | None] = mapped_column(
+        String(64), unique=True, index=True, nullable=True
+    )
     ingested_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -25,19 +47,41 @@ class RawJob(Base):
     environment: Mapped[str] = mapped_column(
         String, nullable=False, default="production", index=True
     )
+    # Set once transform has consumed the row; NULL means still pending
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("idx_raw_jobs_source_ingested", "source", "ingested_at"),
+        # Transform's pending lookup (MAX(id) and the batch scan) reads only this small
+        # index instead of the whole, ever-growing raw_jobs table
+        Index(
+            "idx_raw_jobs_pending",
+            "id",
+            postgresql_where=text("processed_at IS NULL"),
+            sqlite_where=text("processed_at IS NULL"),
+        ),
+    )
 
 
 class Job(Base):
     __tablename__ = "jobs"
 
     id: Mapped[int] = mapped_column(primary_key=True)
+    # Natural key from the source API (unique together when external_id is known)
+    source: Mapped[str | None] = mapped_column(String, nullable=True)
+    external_id: Mapped[str | None] = mapped_column(String, nullable=True)
     title: Mapped[str] = mapped_column(String, nullable=False)
     company: Mapped[str | None] = mapped_column(String, nullable=True)
     location: Mapped[str | None] = mapped_column(String, nullable=True)
     url: Mapped[str | None] = mapped_column(String, unique=True, nullable=True)
     posted_at: Mapped[date | None] = mapped_column(Date, nullable=True)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
-    hash: Mapped[str | None] = mapped_column(String, unique=True, nullable=True)
+    # Truncated SHA-256 of normalized title/company/location/posted_at (see etl.transform.job_hash)
+    hash: Mapped[bytes | None] = mapped_column(LargeBinary(16), unique=True, nullable=True)
+    # Set in the same transaction as the job's skills; NULL means extraction is pending
+    skills_extracted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     skills: Mapped[list[JobSkill]] = relationship(
         back_populates="job",
@@ -47,9 +91,45 @@ class Job(Base):
     __table_args__ = (
         Index("idx_jobs_location", "location"),
         Index("idx_jobs_posted_at", "posted_at"),
+        Index("uq_jobs_source_external_id", "source", "external_id", unique=True),
+        # Only pending jobs are indexed, so finding them stays cheap as jobs grows
+        Index(
+            "idx_jobs_skills_pending",
+            "id",
+            postgresql_where=text("skills_extracted_at IS NULL"),
+            sqlite_where=text("skills_extracted_at IS NULL"),
+        ),
+        # Dashboard search is ILIKE '%term%' on each column; trigram GIN lets
+        # Postgres answer it from the index instead of a seq scan (Postgres only).
+        Index(
+            "idx_jobs_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "idx_jobs_company_trgm",
+            "company",
+            postgresql_using="gin",
+            postgresql_ops={"company": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "idx_jobs_location_trgm",
+            "location",
+            postgresql_using="gin",
+            postgresql_ops={"location": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
     )
 
 
+# create_all() on Postgres needs pg_trgm before the trigram indexes above
+event.listen(
+    Job.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 class JobSkill(Base):
     __tablename__ = "job_skills"
 
@@ -11,25 +11,88 @@ os.environ["ENV"] = "test"
 os.environ["DATABASE_URL"] = "sqlite+pysqlite:///:memory:"
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 
 from jobintel.models import Base
 
 
-@pytest.fixture
-def engine():
-    """Create a fresh in-memory SQLite engine for each test."""
-    eng = create_engine("sqlite+pysqlite:///:memory:")
+def _make_engine():
+    """In-memory SQLite engine with the full schema.
+
+    StaticPool keeps the single connection (and so the database) alive across tests.
+    """
+    eng = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN.
+    # The database is disposable, so durability is off too (matters if this ever
+    # points at a file; in memory it only keeps temp b-trees off disk).
+    @event.listens_for(eng, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        for pragma in ("synchronous=OFF", "journal_mode=MEMORY", "temp_store=MEMORY"):
+            dbapi_connection.execute(f"PRAGMA {pragma}")
+
+    @event.listens_for(eng, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=eng)
+    return eng
+
+
+def _rollback_session(engine):
+    """Yield a session joined to an outer transaction that is rolled back afterwards.
+
+    Code under test may commit freely: with create_savepoint, commit() only
+    releases a SAVEPOINT, so nothing outlives the test and no cleanup DELETEs are needed.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    sess = Session(bind=connection, join_transaction_mode="create_savepoint")
+    yield sess
+    sess.close()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Empty schema, created once for the whole run."""
+    eng = _make_engine()
     yield eng
     eng.dispose()
 
 
 @pytest.fixture
 def session(engine):
-    """Create a session bound to the in-memory engine."""
-    Session = sessionmaker(bind=engine)
-    sess = Session()
-    yield sess
-    sess.close()
+    """Session on the empty schema; changes are rolled back after each test."""
+    yield from _rollback_session(engine)
+
+
+@pytest.fixture(scope="session")
+def seeded_engine():
+    """Schema with the standard fixtures already run through ETL as production data.
+
+    Seeded once per run; tests that only read analytics share it via seeded_session.
+    """
+    from fixtures import seed_and_transform
+
+    from jobintel.analytics.queries import PRODUCTION_ENV
+
+    eng = _make_engine()
+    with Session(eng) as sess:
+        seed_and_transform(sess, environment=PRODUCTION_ENV)
+    yield eng
+    eng.dispose()
+
+
+@pytest.fixture
+def seeded_session(seeded_engine):
+    """Session on the pre-seeded database; changes are rolled back after each test."""
+    yield from _rollback_session(seeded_engine)
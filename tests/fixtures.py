@@ -4,7 +4,11 @@ These replace the old sample_jobs.jsonl approach with controlled, minimal test d
 Uses real source names (remotive, arbeitnow) to test realistic scenarios.
 """
 
-from jobintel.etl.raw import upsert_raw_job
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from jobintel.etl.raw import upsert_raw_jobs_bulk
 from jobintel.etl.skills import extract_skills_for_all_jobs
 from jobintel.etl.transform import transform_jobs
 
@@ -56,6 +60,10 @@ TEST_JOB_PAYLOADS = [
     },
 ]
 
+# Upper bound on distinct skills extracted from TEST_JOB_PAYLOADS (currently 8).
+# Tests use it as the "return everything" limit instead of an arbitrary large one.
+MAX_DISTINCT_SKILLS = 10
+
 # Duplicate URL to test deduplication
 TEST_JOB_DUPLICATE = {
     "source": "remotive",
@@ -79,10 +87,8 @@ def seed_test_data(session, environment: str = "production") -> int:
     Returns:
         Number of jobs inserted
     """
-    inserted = 0
-    for payload in TEST_JOB_PAYLOADS:
-        if upsert_raw_job(session, payload, environment=environment):
-            inserted += 1
+    # One multi-row INSERT ... ON CONFLICT, the same path live ingestion uses
+    inserted = upsert_raw_jobs_bulk(session, TEST_JOB_PAYLOADS, environment=environment)
     session.commit()
     return inserted
 
@@ -106,3 +112,22 @@ def seed_and_transform(session, environment: str = "production") -> dict:
         "jobs_transformed": jobs_transformed,
         "skills_extracted": skills_extracted,
     }
+
+
+@contextmanager
+def count_queries(connection):
+    """Record every SQL statement executed on a connection inside the block.
+
+    Yields the list of statements so tests can assert on how many round trips
+    a query function makes (e.g. to catch N+1 lazy loading).
+    """
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(connection, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", _record)
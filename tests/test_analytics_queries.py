@@ -1,6 +1,9 @@
 """Tests for analytics/queries.py"""
 
-from fixtures import seed_and_transform
+from datetime import date
+
+import pytest
+from fixtures import MAX_DISTINCT_SKILLS, TEST_JOB_DUPLICATE, count_queries, seed_and_transform
 
 from jobintel.analytics.queries import (
     PRODUCTION_ENV,
@@ -8,13 +11,12 @@ from jobintel.analytics.queries import (
     get_top_skills,
     get_top_skills_by_source,
 )
+from jobintel.etl.raw import upsert_raw_job
 
 
-def test_kpis_basic_counts(session):
+def test_kpis_basic_counts(seeded_session):
     """Test that get_kpis returns expected structure with counts."""
-    seed_and_transform(session, environment=PRODUCTION_ENV)
-
-    kpis = get_kpis(session, environment=PRODUCTION_ENV)
+    kpis = get_kpis(seeded_session, environment=PRODUCTION_ENV)
 
     assert "total_jobs" in kpis
     assert "jobs_last_7d" in kpis
@@ -23,54 +25,87 @@ def test_kpis_basic_counts(session):
 
     # Should have 4 jobs from test fixtures
     assert kpis["total_jobs"] == 4
-    assert isinstance(kpis["total_jobs"], int)
-    assert isinstance(kpis["unique_companies"], int)
+    assert type(kpis["total_jobs"]) is int
+    assert type(kpis["unique_companies"]) is int
 
 
-def test_top_skills_respects_limit(session):
-    """Test that get_top_skills respects the limit parameter."""
-    seed_and_transform(session, environment=PRODUCTION_ENV)
+def test_kpis_last_7d_is_relative_to_today(seeded_session):
+    """jobs_last_7d counts jobs posted in the week before the given day."""
+    # Fixture jobs are posted 2026-01-07 .. 2026-01-10
+    kpis = get_kpis(seeded_session, environment=PRODUCTION_ENV, today=date(2026, 1, 15))
+    assert kpis["jobs_last_7d"] == 3
 
+    kpis = get_kpis(seeded_session, environment=PRODUCTION_ENV, today=date(2026, 3, 1))
+    assert kpis["jobs_last_7d"] == 0
+
+
+def test_top_skills_respects_limit(seeded_session):
+    """Test that get_top_skills respects the limit parameter."""
     # Request only 3 skills
-    skills_3 = get_top_skills(session, limit=3, environment=PRODUCTION_ENV)
+    skills_3 = get_top_skills(seeded_session, limit=3, environment=PRODUCTION_ENV)
     assert len(skills_3) <= 3
 
-    # Request more skills
-    skills_20 = get_top_skills(session, limit=20, environment=PRODUCTION_ENV)
-    assert len(skills_20) <= 20
+    # Request every skill; the bound must stay above what the fixtures produce
+    skills_all = get_top_skills(
+        seeded_session, limit=MAX_DISTINCT_SKILLS, environment=PRODUCTION_ENV
+    )
+    assert len(skills_all) < MAX_DISTINCT_SKILLS, "Raise MAX_DISTINCT_SKILLS in fixtures.py"
 
     # The 3-skill list should be a subset
-    if skills_3 and skills_20:
+    if skills_3 and skills_all:
         top_3_skills = {s for s, _ in skills_3}
-        top_20_skills = {s for s, _ in skills_20}
-        assert top_3_skills.issubset(top_20_skills)
+        all_skills = {s for s, _ in skills_all}
+        assert top_3_skills.issubset(all_skills)
 
 
-def test_top_skills_counts_distinct_jobs(session):
+def test_top_skills_counts_distinct_jobs(seeded_session):
     """Test that top_skills counts distinct jobs, not total mentions."""
-    seed_and_transform(session, environment=PRODUCTION_ENV)
+    skills = get_top_skills(seeded_session, limit=MAX_DISTINCT_SKILLS, environment=PRODUCTION_ENV)
 
-    skills = get_top_skills(session, limit=50, environment=PRODUCTION_ENV)
+    # Each skill should be a name with a positive int count (exactly int, not a subclass)
+    assert skills
+    assert all(type(s) is str and type(c) is int and c > 0 for s, c in skills), skills
 
-    # Each skill should have a positive count
-    for skill, count in skills:
-        assert isinstance(skill, str)
-        assert isinstance(count, int)
-        assert count > 0
 
+@pytest.mark.parametrize(
+    "filters",
+    [{}, {"source": "remotive", "search": "engineer"}],
+    ids=["unfiltered", "filtered"],
+)
+def test_top_skills_avoids_count_distinct(seeded_session, filters):
+    """Top skills counts rows of a semi-joined set, not COUNT(DISTINCT job_id)."""
+    with count_queries(seeded_session.connection()) as statements:
+        get_top_skills(seeded_session, limit=5, environment=PRODUCTION_ENV, **filters)
 
-def test_top_skills_with_source_filter(session):
-    """Test that source filter works."""
+    sql = " ".join(statements).upper()
+    assert "COUNT(DISTINCT" not in sql
+    assert "EXISTS" in sql
+
+
+def test_top_skills_counts_job_once_with_duplicate_raw_rows(session):
+    """A job backed by several raw rows (same URL) is still counted once per skill."""
     seed_and_transform(session, environment=PRODUCTION_ENV)
+    before = dict(get_top_skills(session, limit=MAX_DISTINCT_SKILLS, environment=PRODUCTION_ENV))
+
+    upsert_raw_job(session, TEST_JOB_DUPLICATE, environment=PRODUCTION_ENV)
+    session.commit()
+
+    assert (
+        dict(get_top_skills(session, limit=MAX_DISTINCT_SKILLS, environment=PRODUCTION_ENV))
+        == before
+    )
 
+
+def test_top_skills_with_source_filter(seeded_session):
+    """Test that source filter works."""
     # Get skills from remotive only
     remotive_skills = get_top_skills(
-        session, source="remotive", limit=50, environment=PRODUCTION_ENV
+        seeded_session, source="remotive", limit=MAX_DISTINCT_SKILLS, environment=PRODUCTION_ENV
     )
 
     # Get skills from arbeitnow only
     arbeitnow_skills = get_top_skills(
-        session, source="arbeitnow", limit=50, environment=PRODUCTION_ENV
+        seeded_session, source="arbeitnow", limit=MAX_DISTINCT_SKILLS, environment=PRODUCTION_ENV
     )
 
     # Both should have results since our test data has jobs from both sources
@@ -78,11 +113,11 @@ def test_top_skills_with_source_filter(session):
     assert len(arbeitnow_skills) > 0, "Arbeitnow should have skills"
 
 
-def test_top_skills_by_source(session):
+def test_top_skills_by_source(seeded_session):
     """Test get_top_skills_by_source returns grouped data."""
-    seed_and_transform(session, environment=PRODUCTION_ENV)
-
-    results = get_top_skills_by_source(session, limit=10, environment=PRODUCTION_ENV)
+    results = get_top_skills_by_source(
+        seeded_session, limit=MAX_DISTINCT_SKILLS, environment=PRODUCTION_ENV
+    )
 
     # Should be dict: {"remotive": [(skill, count), ...], "arbeitnow": [...]}
     assert len(results) > 0
@@ -90,9 +125,7 @@ def test_top_skills_by_source(session):
     for source, skills in results.items():
         assert source in ("remotive", "arbeitnow")
         assert isinstance(skills, list)
-        for skill, count in skills:
-            assert isinstance(skill, str)
-            assert count > 0
+        assert all(type(s) is str and type(c) is int and c > 0 for s, c in skills), skills
 
 
 def test_environment_filtering_excludes_other_envs(session):
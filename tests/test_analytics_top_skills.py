@@ -1,15 +1,13 @@
 """Tests for analytics top_skills function."""
 
-from fixtures import seed_and_transform
+from fixtures import MAX_DISTINCT_SKILLS
 
 from jobintel.analytics.top_skills import top_skills
 
 
-def test_top_skills_returns_counts(session):
+def test_top_skills_returns_counts(seeded_session):
     """top_skills should return skill names with positive counts."""
-    seed_and_transform(session, environment="test")
-
-    rows = top_skills(session, limit=50)
+    rows = top_skills(seeded_session, limit=MAX_DISTINCT_SKILLS)
     skills = {s for (s, _) in rows}
 
     # Our test data has Python in multiple jobs
@@ -6,24 +6,22 @@ using SQLite (in-memory test database).
 
 from datetime import datetime, timedelta
 
-from sqlalchemy import select
+import pytest
+from sqlalchemy import DateTime, insert, literal, select
+from sqlalchemy.dialects import postgresql
 
-from jobintel.analytics.queries import bucket_expr, get_skill_trends
+from jobintel.analytics.queries import TrendRow, bucket_expr, get_skill_trends
 from jobintel.etl.skills import extract_skills_for_all_jobs
 from jobintel.etl.transform import transform_jobs
 from jobintel.models import RawJob
 
 
-def seed_jobs_with_times(session, times: list[datetime], environment: str = "test") -> int:
-    """Seed RawJob records with specific ingested_at times.
-
-    Creates jobs with skills for trends testing.
-    """
-    inserted = 0
-    for i, ts in enumerate(times):
-        raw = RawJob(
-            source="test_source",
-            payload_json={
+def seed_raw_jobs_with_times(session, times: list[datetime], environment: str = "test") -> int:
+    """Seed RawJob records with specific ingested_at times (raw_jobs only)."""
+    rows = [
+        {
+            "source": "test_source",
+            "payload_json": {
                 "url": f"https://test.com/job/{i}",
                 "title": f"Test Job {i}",
                 "company": "TestCorp",
@@ -32,16 +30,35 @@ def seed_jobs_with_times(session, times: list[datetime], environment: str = "tes
                 "tags": ["python", "django"],
                 "posted_at": ts.date().isoformat(),
             },
-            ingested_at=ts,
-            environment=environment,
-        )
-        session.add(raw)
-        inserted += 1
-
+            "ingested_at": ts,
+            "environment": environment,
+        }
+        for i, ts in enumerate(times)
+    ]
+    # One executemany instead of a unit-of-work INSERT per ORM object
+    session.execute(insert(RawJob), rows)
     session.commit()
+    return len(rows)
+
+
+def seed_jobs_with_skills(session, times: list[datetime], environment: str = "test") -> int:
+    """Seed RawJob records and run transform + skills extraction for trends testing."""
+    inserted = seed_raw_jobs_with_times(session, times, environment)
+    transform_jobs(session)
+    extract_skills_for_all_jobs(session)
     return inserted
 
 
+def _eval_buckets(session, times: list[datetime], bucket: str) -> list[str]:
+    """Evaluate bucket_expr on literal timestamps in one SELECT; no rows are seeded."""
+    exprs = [
+        bucket_expr(literal(ts, DateTime()), bucket, "sqlite").element.label(f"b{i}")
+        for i, ts in enumerate(times)
+    ]
+    row = session.execute(select(*exprs)).one()
+    return sorted(set(row))
+
+
 class TestBucketExpr:
     """Test the bucket_expr function for SQLite."""
 
@@ -56,7 +73,7 @@ class TestBucketExpr:
             base_date.replace(hour=19),  # -> 18:00
         ]
 
-        inserted = seed_jobs_with_times(session, times, environment="test")
+        inserted = seed_raw_jobs_with_times(session, times, environment="test")
         assert inserted == 4, f"Expected 4 jobs, got {inserted}"
 
         # Verify we have 4 RawJob rows
@@ -82,37 +99,40 @@ class TestBucketExpr:
             base_date.replace(hour=19),
         ]
 
-        seed_jobs_with_times(session, times, environment="test")
-
-        # Query with bucket_expr for day
-        bucket_col = bucket_expr(RawJob.ingested_at, "day", "sqlite")
-        results = session.execute(
-            select(bucket_col).where(RawJob.environment == "test").distinct()
-        ).all()
-
         # Should have 1 distinct bucket (same day)
-        assert len(results) == 1, f"Expected 1 distinct day bucket, got {len(results)}"
+        assert _eval_buckets(session, times, "day") == ["2026-01-15"]
 
     def test_bucket_week_groups_same_week(self, session):
         """Week bucketing should group records in the same week."""
-        # Create jobs on Mon, Wed, Fri of the same week
+        # Create jobs on Mon, Wed, Fri, Sun of the same week
         base_monday = datetime(2026, 1, 12)  # A Monday
         times = [
             base_monday,
             base_monday + timedelta(days=2),  # Wednesday
             base_monday + timedelta(days=4),  # Friday
+            base_monday + timedelta(days=6, hours=23),  # Sunday night
         ]
 
-        seed_jobs_with_times(session, times, environment="test")
-
-        # Query with bucket_expr for week
-        bucket_col = bucket_expr(RawJob.ingested_at, "week", "sqlite")
-        results = session.execute(
-            select(bucket_col).where(RawJob.environment == "test").distinct()
-        ).all()
+        # Should have 1 distinct bucket (same week), starting on the Monday
+        assert _eval_buckets(session, times, "week") == ["2026-01-12"]
+
+    @pytest.mark.parametrize(
+        ("bucket", "expected"),
+        [
+            ("6h", "date_trunc('day', raw_jobs.ingested_at)"),
+            ("day", "date_trunc('day', raw_jobs.ingested_at)"),
+            ("week", "date_trunc('week', raw_jobs.ingested_at)"),
+        ],
+    )
+    def test_bucket_postgres_sql(self, bucket, expected):
+        """Postgres bucketing compiles to date_trunc (no database needed)."""
+        expr = bucket_expr(RawJob.ingested_at, bucket, "postgresql")
+        sql = str(
+            expr.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        )
 
-        # Should have 1 distinct bucket (same week)
-        assert len(results) == 1, f"Expected 1 distinct week bucket, got {len(results)}"
+        assert expected in sql
+        assert ("interval '6 hours'" in sql) == (bucket == "6h")
 
 
 class TestGetSkillTrendsGranularity:
@@ -128,9 +148,7 @@ class TestGetSkillTrendsGranularity:
             base_date.replace(hour=19),
         ]
 
-        seed_jobs_with_times(session, times, environment="test")
-        transform_jobs(session)
-        extract_skills_for_all_jobs(session)
+        seed_jobs_with_skills(session, times, environment="test")
 
         # Get trends with 6h granularity
         trends = get_skill_trends(
@@ -140,9 +158,11 @@ class TestGetSkillTrendsGranularity:
             environment="test",
         )
 
-        # Should have multiple buckets
-        buckets = {t["bucket"] for t in trends}
-        assert len(buckets) >= 1, "Expected at least 1 bucket in trends"
+        assert all(type(t) is TrendRow for t in trends)
+
+        # One bucket per 6h block the jobs were ingested in
+        buckets = {t.bucket for t in trends}
+        assert len(buckets) == 4, f"Expected 4 distinct 6h buckets, got {buckets}"
 
     def test_trends_auto_granularity_short_range(self, session):
         """Auto granularity should use 6h for ≤7 day range."""
@@ -151,9 +171,7 @@ class TestGetSkillTrendsGranularity:
         base_date = datetime(2026, 1, 15)
         times = [base_date.replace(hour=1), base_date.replace(hour=13)]
 
-        seed_jobs_with_times(session, times, environment="test")
-        transform_jobs(session)
-        extract_skills_for_all_jobs(session)
+        seed_jobs_with_skills(session, times, environment="test")
 
         # Request with short date range (auto should pick 6h)
         trends = get_skill_trends(
@@ -178,9 +196,7 @@ class TestGetSkillTrendsGranularity:
         base_date = datetime(2026, 1, 15)
         times = [base_date.replace(hour=1), base_date.replace(hour=13)]
 
-        seed_jobs_with_times(session, times, environment="test")
-        transform_jobs(session)
-        extract_skills_for_all_jobs(session)
+        seed_jobs_with_skills(session, times, environment="test")
 
         # Request without date range (should default to 6h)
         trends = get_skill_trends(
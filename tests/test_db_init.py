@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from sqlalchemy import inspect
 
 from jobintel.db import engine, init_db
@@ -7,3 +9,15 @@ def test_init_db_creates_tables():
     init_db()
     tables = set(inspect(engine).get_table_names())
     assert {"raw_jobs", "jobs", "job_skills", "ingest_runs"}.issubset(tables)
+
+
+def test_init_db_runs_schema_setup_once():
+    init_db.cache_clear()
+    try:
+        with patch("jobintel.models.Base.metadata.create_all") as create_all:
+            init_db()
+            init_db()
+        create_all.assert_called_once()
+    finally:
+        # Don't leave the mocked call cached for later init_db() users
+        init_db.cache_clear()
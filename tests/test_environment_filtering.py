@@ -3,31 +3,18 @@
 This is a guardrail test to prevent regression on environment filtering.
 """
 
-import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import select
 
 from jobintel.analytics.queries import PRODUCTION_ENV, get_kpis, get_top_skills
-from jobintel.etl.raw import upsert_raw_job
+from jobintel.etl.raw import upsert_raw_jobs_bulk
 from jobintel.etl.skills import extract_skills_for_all_jobs
 from jobintel.etl.transform import transform_jobs
-from jobintel.models import Base, RawJob
-
-
-@pytest.fixture
-def session():
-    """Create an in-memory SQLite database for testing."""
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(bind=engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    yield session
-    session.close()
+from jobintel.models import RawJob
 
 
 def test_queries_exclude_non_production_data(session):
     """Dashboard queries should only return production environment data."""
-    # Insert a production job
+    # A production job
     prod_payload = {
         "source": "remotive",
         "title": "Production Engineer",
@@ -36,9 +23,8 @@ def test_queries_exclude_non_production_data(session):
         "url": "https://real.com/job/1",
         "description": "Python, AWS, Docker",
     }
-    upsert_raw_job(session, prod_payload, environment="production")
 
-    # Insert a test job (using a real source, but tagged as test environment)
+    # A test job (using a real source, but tagged as test environment)
     test_payload = {
         "source": "arbeitnow",
         "title": "Test Engineer",
@@ -47,8 +33,10 @@ def test_queries_exclude_non_production_data(session):
         "url": "https://test.com/job/1",
         "description": "Testing, QA, Selenium",
     }
-    upsert_raw_job(session, test_payload, environment="test")
 
+    # One INSERT per environment instead of a SELECT + INSERT per payload
+    upsert_raw_jobs_bulk(session, [prod_payload], environment="production")
+    upsert_raw_jobs_bulk(session, [test_payload], environment="test")
     session.commit()
 
     # Transform to jobs table
@@ -79,12 +67,12 @@ def test_environment_is_correctly_tagged(session):
     }
 
     # When we explicitly set environment='test', it should stick
-    upsert_raw_job(session, payload, environment="test")
+    upsert_raw_jobs_bulk(session, [payload], environment="test")
     session.commit()
 
-    raw_job = session.query(RawJob).first()
-    assert raw_job.environment == "test", "Job should have test environment"
-    assert raw_job.source == "remotive"
+    env, source = session.execute(select(RawJob.environment, RawJob.source).limit(1)).one()
+    assert env == "test", "Job should have test environment"
+    assert source == "remotive"
 
 
 def test_production_is_default_environment_constant():
@@ -1,13 +1,12 @@
-from sqlalchemy import func, select, text
+from sqlalchemy import func, select
 
-from jobintel.db import SessionLocal, init_db
-from jobintel.etl.raw import upsert_raw_job
+from jobintel.etl.pipeline import run_etl_from_payloads
+from jobintel.etl.raw import upsert_raw_job, upsert_raw_jobs_bulk
+from jobintel.etl.sources.arbeitnow import _normalize_job
 from jobintel.models import RawJob
 
 
-def test_upsert_raw_job_is_idempotent():
-    init_db()
-
+def test_upsert_raw_job_is_idempotent(session):
     payload = {
         "source": "test",
         "url": "https://example.com/job/1",
@@ -18,15 +17,65 @@ def test_upsert_raw_job_is_idempotent():
         "description": "We use Python, SQL, and AWS.",
     }
 
-    with SessionLocal() as session:
-        session.execute(text("DELETE FROM raw_jobs"))
-        session.commit()
+    assert upsert_raw_job(session, payload) is True
+    session.commit()
+
+    assert upsert_raw_job(session, payload) is False
+    session.commit()
+
+    n = session.execute(select(func.count()).select_from(RawJob)).scalar_one()
+    assert n == 1
+
+
+def test_upsert_raw_jobs_bulk_skips_seen_and_keeps_payload(session):
+    payloads = [
+        {"source": "test", "url": "https://example.com/job/1", "title": "Data Engineer"},
+        {"source": "test", "url": "https://example.com/job/2", "title": "ML Engineer"},
+    ]
+
+    assert upsert_raw_jobs_bulk(session, payloads, environment="test") == 2
+    assert upsert_raw_jobs_bulk(session, payloads, environment="test") == 0
+    session.commit()
+
+    # Caller's dicts are stored as-is; the hash lives in its own column
+    assert all("content_hash" not in p for p in payloads)
+    hashes = session.execute(select(RawJob.content_hash)).scalars().all()
+    assert len(hashes) == 2
+    assert all(hashes)
+
+
+def test_same_role_in_two_cities_is_kept_twice(session):
+    """Arbeitnow's content_hash ignores URL and location; the dedup key must not."""
+    berlin = {
+        "slug": "backend-engineer-berlin-1",
+        "company_name": "TechCorp GmbH",
+        "title": "Backend Engineer",
+        "description": "Python services.",
+        "url": "https://www.arbeitnow.com/jobs/techcorp/backend-engineer-berlin-1",
+        "location": "Berlin",
+        "created_at": 1700000000,
+    }
+    munich = {
+        **berlin,
+        "slug": "backend-engineer-munich-2",
+        "url": "https://www.arbeitnow.com/jobs/techcorp/backend-engineer-munich-2",
+        "location": "Munich",
+    }
+    payloads = [_normalize_job(berlin), _normalize_job(munich)]
+    assert payloads[0]["content_hash"] == payloads[1]["content_hash"]
+
+    result = run_etl_from_payloads(session, payloads, environment="test")
+
+    assert (result.inserted_raw, result.inserted_jobs) == (2, 2)
+
 
-        assert upsert_raw_job(session, payload) is True
-        session.commit()
+def test_upsert_raw_job_keeps_listings_sharing_a_supplied_hash(session):
+    """A source-supplied content_hash without the URL must not merge two listings."""
+    base = {"source": "arbeitnow", "title": "Backend Engineer", "content_hash": "same"}
 
-        assert upsert_raw_job(session, payload) is False
-        session.commit()
+    assert upsert_raw_job(session, {**base, "url": "https://a/berlin", "location": "Berlin"})
+    assert upsert_raw_job(session, {**base, "url": "https://a/munich", "location": "Munich"})
+    assert not upsert_raw_job(session, {**base, "url": "https://a/munich", "location": "Munich"})
 
-        n = session.execute(select(func.count()).select_from(RawJob)).scalar_one()
-        assert n == 1
+    n = session.execute(select(func.count()).select_from(RawJob)).scalar_one()
+    assert n == 2
@@ -1,10 +1,16 @@
 """Tests for ETL skills extraction."""
 
-from fixtures import seed_test_data
+from collections import OrderedDict
+from unittest.mock import patch
 
-from jobintel.etl.skills import extract_skills_for_all_jobs
+import pytest
+from fixtures import TEST_JOB_PAYLOADS, count_queries, seed_test_data
+
+import jobintel.etl.skills as skills_module
+from jobintel.etl.pipeline import run_etl_from_payloads, run_postprocess
+from jobintel.etl.skills import extract_skills, extract_skills_for_all_jobs
 from jobintel.etl.transform import transform_jobs
-from jobintel.models import JobSkill
+from jobintel.models import Job, JobSkill, RawJob
 
 
 def test_extract_skills_is_idempotent(session):
@@ -13,11 +19,110 @@ def test_extract_skills_is_idempotent(session):
     transform_jobs(session)
 
     first = extract_skills_for_all_jobs(session)
-    second = extract_skills_for_all_jobs(session)
+    with count_queries(session.connection()) as statements:
+        second = extract_skills_for_all_jobs(session)
 
     assert first > 0, "First run should extract some skills"
     assert second == 0, "Second run should extract zero (already processed)"
+    # One read of the (empty) pending set; no re-scan of processed jobs
+    assert len(statements) <= 2
 
     # Verify no duplicate (job_id, skill) pairs
     pairs = session.query(JobSkill.job_id, JobSkill.skill).all()
     assert len(pairs) == len(set(pairs)), "Should have no duplicate skill assignments"
+
+
+def test_run_etl_extracts_skills_for_new_jobs(session):
+    """The pipeline extracts skills from the jobs transform just inserted."""
+    result = run_etl_from_payloads(session, TEST_JOB_PAYLOADS, environment="test")
+
+    assert result.inserted_jobs == 4
+    assert result.inserted_skills > 0
+    assert result.inserted_skills == session.query(JobSkill).count()
+
+
+def test_extract_skills_returns_fresh_set():
+    """Cached results must not leak caller mutations into later calls."""
+    text = "Python and SQL on AWS"
+    first = extract_skills(text)
+    first.add("mutated")
+
+    assert extract_skills(text) == {"python", "sql", "aws"}
+
+
+def test_extract_skills_cache_is_keyed_on_digest_and_bounded(monkeypatch):
+    """The memo holds 16-byte digests, never the descriptions, and evicts oldest first."""
+    monkeypatch.setattr(skills_module, "_CACHE_SIZE", 2)
+    monkeypatch.setattr(skills_module, "_cache", OrderedDict())
+
+    for text in ("Python " * 1000, "SQL " * 1000, "AWS " * 1000):
+        extract_skills(text)
+
+    assert len(skills_module._cache) == 2
+    assert all(isinstance(k, bytes) and len(k) == 16 for k in skills_module._cache)
+    assert set(skills_module._cache.values()) == {frozenset({"sql"}), frozenset({"aws"})}
+
+
+def test_extract_skills_matches_phrases_and_word_boundaries():
+    text = "Scikit-learn, Amazon Web Services, PostgreSQL and continuous integration"
+    assert extract_skills(text) == {"scikit-learn", "aws", "postgres", "ci"}
+    assert extract_skills("SQLAlchemy and cipher suites") == set()
+
+
+def test_run_etl_skips_transform_when_all_payloads_are_duplicates(session):
+    run_etl_from_payloads(session, TEST_JOB_PAYLOADS, environment="test")
+
+    with patch("jobintel.etl.pipeline.transform_new_jobs") as mock_transform:
+        result = run_etl_from_payloads(session, TEST_JOB_PAYLOADS, environment="test")
+
+    mock_transform.assert_not_called()
+    assert (result.inserted_raw, result.inserted_jobs, result.inserted_skills) == (0, 0, 0)
+
+
+def test_duplicate_only_ingest_still_processes_pending_raw_rows(session):
+    """An ingest with nothing new must not strand rows an earlier run left pending."""
+    with patch("jobintel.etl.pipeline.transform_new_jobs", side_effect=RuntimeError("boom")):
+        with pytest.raises(RuntimeError):
+            run_etl_from_payloads(session, TEST_JOB_PAYLOADS, environment="test")
+    assert session.query(Job).count() == 0
+
+    result = run_etl_from_payloads(session, TEST_JOB_PAYLOADS, environment="test")
+
+    assert result.inserted_raw == 0
+    assert result.inserted_jobs == len(TEST_JOB_PAYLOADS)
+    assert result.inserted_skills > 0
+    assert session.query(RawJob).filter(RawJob.processed_at.is_(None)).count() == 0
+
+
+def test_extract_skills_rescan_reads_every_job(session):
+    """rescan=True ignores the watermark but still skips pairs already stored."""
+    seed_test_data(session, environment="test")
+    transform_jobs(session)
+    extract_skills_for_all_jobs(session)
+
+    with patch("jobintel.etl.skills.extract_skills_for_rows", return_value=0) as mock_rows:
+        extract_skills_for_all_jobs(session, rescan=True)
+
+    assert len(mock_rows.call_args.args[1]) == 4
+    assert extract_skills_for_all_jobs(session, rescan=True) == 0
+
+
+def test_jobs_left_pending_by_failed_extraction_are_picked_up_later(session):
+    """A run that commits jobs but fails in extraction must not strand them."""
+    first, later = TEST_JOB_PAYLOADS[:3], TEST_JOB_PAYLOADS[3:]
+
+    with patch(
+        "jobintel.etl.pipeline.extract_skills_for_all_jobs", side_effect=RuntimeError("boom")
+    ):
+        with pytest.raises(RuntimeError):
+            run_etl_from_payloads(session, first, environment="test")
+    assert session.query(Job).filter(Job.skills_extracted_at.is_(None)).count() == 3
+
+    # The next ingest extracts for the stranded jobs as well as its own
+    result = run_etl_from_payloads(session, later, environment="test")
+
+    assert result.inserted_jobs == 1
+    assert session.query(Job).filter(Job.skills_extracted_at.is_(None)).count() == 0
+    with_skills = {job_id for (job_id,) in session.query(JobSkill.job_id).distinct()}
+    assert with_skills == {job_id for (job_id,) in session.query(Job.id)}
+    assert run_postprocess(session) == (0, 0)
@@ -1,29 +1,124 @@
 """Tests for ETL transform step."""
 
+import pytest
 from fixtures import TEST_JOB_DUPLICATE, seed_test_data
+from sqlalchemy import func, select, text
 
+from jobintel.etl.pipeline import run_postprocess
 from jobintel.etl.raw import upsert_raw_job
-from jobintel.etl.transform import transform_jobs
-from jobintel.models import Job
+from jobintel.etl.transform import job_hash, transform_jobs
+from jobintel.models import Job, RawJob
 
 
-def test_transform_dedupes_by_url(session):
+@pytest.mark.parametrize("with_duplicate", [False, True])
+def test_transform_dedupes_by_url(session, with_duplicate):
     """Transform should deduplicate jobs by URL."""
     # Insert test data (4 unique jobs)
     seed_test_data(session, environment="test")
 
-    # Insert a duplicate (same URL as first job)
-    upsert_raw_job(session, TEST_JOB_DUPLICATE, environment="test")
-    session.commit()
+    if with_duplicate:
+        # Same URL as the first job; must not produce a fifth job
+        upsert_raw_job(session, TEST_JOB_DUPLICATE, environment="test")
+        session.commit()
 
     inserted = transform_jobs(session)
 
     # Should only create 4 unique jobs (duplicate URL skipped)
     assert inserted == 4
 
-    jobs = session.query(Job).all()
-    assert len(jobs) == 4
+    urls = session.execute(select(Job.url)).scalars().all()
+    assert len(urls) == 4
 
     # Verify no duplicate URLs
-    urls = [j.url for j in jobs]
     assert len(urls) == len(set(urls)), "Jobs should have unique URLs"
+
+
+def test_job_hash_is_normalized_128_bit_digest():
+    """job_hash ignores case/whitespace and yields a 16-byte fingerprint."""
+    h = job_hash(" Data Engineer ", "ACME", None, None)
+    assert h == job_hash("data engineer", "acme", "", None)
+    assert isinstance(h, bytes)
+    assert len(h) == 16
+
+
+def test_transform_only_reads_unprocessed_raw_rows(session):
+    """Raw rows are marked processed and skipped by later transforms."""
+    seed_test_data(session, environment="test")
+
+    assert transform_jobs(session) == 4
+    assert session.query(RawJob).filter(RawJob.processed_at.is_(None)).count() == 0
+
+    # Remove a job: its raw row is already processed, so it is not recreated.
+    session.delete(session.query(Job).first())
+    session.commit()
+    assert transform_jobs(session) == 0
+
+
+def test_transform_skips_urls_already_in_jobs(session):
+    """A raw row whose URL is already a job is filtered out on a later run."""
+    seed_test_data(session, environment="test")
+    assert transform_jobs(session) == 4
+
+    upsert_raw_job(session, TEST_JOB_DUPLICATE, environment="test")
+    session.commit()
+
+    assert transform_jobs(session) == 0
+    assert session.query(Job).count() == 4
+
+
+def test_transform_dedupes_by_source_external_id(session):
+    """The source's own job ID dedupes listings re-posted under a new URL."""
+    base = {"source": "remotive", "external_id": "42", "company": "Acme"}
+    upsert_raw_job(session, {**base, "url": "https://a/1", "title": "Data Engineer"})
+    session.commit()
+    assert transform_jobs(session) == 1
+
+    # Same ID, different URL and title: skipped by the unique index on a later run
+    upsert_raw_job(session, {**base, "url": "https://a/2", "title": "Sr Data Engineer"})
+    session.commit()
+    assert transform_jobs(session) == 0
+
+    job = session.query(Job).one()
+    assert (job.source, job.external_id) == ("remotive", "42")
+
+
+@pytest.mark.parametrize("missing_id", [None, "", "None"])
+def test_transform_keeps_jobs_without_source_external_id(session, missing_id):
+    """Jobs with no source ID don't collide on the (source, external_id) index."""
+    for n in (1, 2):
+        upsert_raw_job(
+            session,
+            {
+                "source": "remotive",
+                "external_id": missing_id,
+                "url": f"https://a/{n}",
+                "title": f"Engineer {n}",
+            },
+        )
+    session.commit()
+
+    assert transform_jobs(session) == 2
+    assert {job.external_id for job in session.query(Job)} == {None}
+
+
+def test_pending_raw_lookup_uses_partial_index(session):
+    """Finding unprocessed raw rows reads the partial index, not the whole table."""
+    stmt = select(func.max(RawJob.id)).where(RawJob.processed_at.is_(None))
+    sql = str(stmt.compile(session.get_bind(), compile_kwargs={"literal_binds": True}))
+
+    plan = " ".join(str(row) for row in session.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+    assert "idx_raw_jobs_pending" in plan
+
+
+def test_run_postprocess_reprocess_rereads_stamped_raw_rows(session):
+    """Only reprocess=True goes back over raw rows already marked processed."""
+    seed_test_data(session, environment="test")
+    assert run_postprocess(session)[0] == 4
+
+    session.delete(session.scalars(select(Job).limit(1)).one())
+    session.commit()
+
+    assert run_postprocess(session) == (0, 0)
+    inserted_jobs, inserted_skills = run_postprocess(session, reprocess=True)
+    assert inserted_jobs == 1
+    assert inserted_skills > 0
@@ -1,116 +1,196 @@
 """Tests for ingest run logging."""
 
-from unittest.mock import patch
+import math
+from collections import Counter
+from unittest.mock import MagicMock
 
 import pytest
+from fixtures import count_queries
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
-from jobintel.db import SessionLocal, init_db
-from jobintel.etl.pipeline import run_ingest
+from jobintel.etl import pipeline
+from jobintel.etl.pipeline import run_ingest, run_ingest_multi
 from jobintel.models import IngestRun
 
+_BASE_PAYLOAD = {
+    "id": "test-123",
+    "source": "remotive",
+    "title": "Test Engineer",
+    "company_name": "Test Co",
+    "candidate_required_location": "Remote",
+    "url": "https://example.com/test-123",
+    "description": "Testing with Python and pytest",
+    "publication_date": "2024-01-15",
+}
 
-@pytest.fixture(autouse=True)
-def setup_db():
-    """Ensure tables exist before each test."""
-    init_db()
-    yield
-    # Clean up ingest_runs after each test
-    with SessionLocal() as s:
-        s.query(IngestRun).delete()
-        s.commit()
+# Built once; every call then reuses the same statement (and its compiled-cache entry)
+_LATEST_RUN = select(IngestRun).order_by(IngestRun.id.desc()).limit(1)
 
 
-def test_successful_ingest_logs_run():
+def make_payload(**overrides):
+    """Remotive-style fake payload; only the overridden keys differ from the base."""
+    return {**_BASE_PAYLOAD, **overrides}
+
+
+@pytest.fixture
+def mock_fetch(monkeypatch):
+    """Replace the pipeline's source fetch; tests set return_value or side_effect."""
+    fetch = MagicMock()
+    monkeypatch.setattr("jobintel.etl.pipeline.fetch_from_source", fetch)
+    return fetch
+
+
+def test_successful_ingest_logs_run(session, mock_fetch):
     """Test that a successful ingest creates an IngestRun record."""
-    fake_payloads = [
-        {
-            "id": "test-123",
-            "source": "remotive",
-            "title": "Test Engineer",
-            "company_name": "Test Co",
-            "candidate_required_location": "Remote",
-            "url": "https://example.com/test-123",
-            "description": "Testing with Python and pytest",
-            "publication_date": "2024-01-15",
-        }
-    ]
+    fake_payloads = [make_payload()]
 
-    with patch("jobintel.etl.pipeline.fetch_from_source") as mock_fetch:
-        mock_fetch.return_value = (fake_payloads, [])
+    mock_fetch.return_value = (fake_payloads, [])
 
-        with SessionLocal() as session:
-            result = run_ingest(session, "remotive", "test", 10)
+    result = run_ingest(session, "remotive", "test", 10)
 
-            assert result.fetched == 1
+    assert result.fetched == 1
 
-            # Check that an IngestRun record was created
-            run = session.query(IngestRun).order_by(IngestRun.id.desc()).first()
-            assert run is not None
-            assert run.source == "remotive"
-            assert run.search == "test"
-            assert run.limit == 10
-            assert run.status == "success"
-            assert run.fetched == 1
-            assert run.finished_at is not None
-            assert run.error is None
+    # Check that an IngestRun record was created
+    run = session.execute(_LATEST_RUN).scalar_one_or_none()
+    assert run is not None
+    assert run.source == "remotive"
+    assert run.search == "test"
+    assert run.limit == 10
+    assert run.status == "success"
+    assert run.fetched == 1
+    assert run.finished_at is not None
+    assert run.error is None
 
 
-def test_successful_ingest_with_warnings_logs_run():
+def test_successful_ingest_with_warnings_logs_run(session, mock_fetch):
     """Test that warnings are captured in the IngestRun record."""
     fake_payloads = [
-        {
-            "id": "test-456",
-            "source": "remotive",
-            "title": "Test Dev",
-            "company_name": "Test Inc",
-            "candidate_required_location": "Remote",
-            "url": "https://example.com/test-456",
-            "description": "JavaScript development",
-            "publication_date": "2024-01-16",
-        }
+        make_payload(
+            id="test-456",
+            title="Test Dev",
+            company_name="Test Inc",
+            url="https://example.com/test-456",
+            description="JavaScript development",
+            publication_date="2024-01-16",
+        )
     ]
     warnings = ["Skipped 2 invalid payloads"]
 
-    with patch("jobintel.etl.pipeline.fetch_from_source") as mock_fetch:
-        mock_fetch.return_value = (fake_payloads, warnings)
+    mock_fetch.return_value = (fake_payloads, warnings)
 
-        with SessionLocal() as session:
-            result = run_ingest(session, "remotive", "dev", 20)
+    result = run_ingest(session, "remotive", "dev", 20)
 
-            assert result.warnings == warnings
+    assert result.warnings == warnings
 
-            run = session.query(IngestRun).order_by(IngestRun.id.desc()).first()
-            assert run is not None
-            assert run.status == "success"
-            assert run.warnings == warnings
+    run = session.execute(_LATEST_RUN).scalar_one_or_none()
+    assert run is not None
+    assert run.status == "success"
+    assert run.warnings == warnings
 
 
-def test_failed_ingest_logs_error():
+def test_failed_ingest_logs_error(session, mock_fetch):
     """Test that a failed ingest logs the error."""
-    with patch("jobintel.etl.pipeline.fetch_from_source") as mock_fetch:
-        mock_fetch.side_effect = ValueError("API connection failed")
+    mock_fetch.side_effect = ValueError("API connection failed")
 
-        with SessionLocal() as session:
-            with pytest.raises(ValueError, match="API connection failed"):
-                run_ingest(session, "remotive", "test", 10)
+    with pytest.raises(ValueError, match="API connection failed"):
+        run_ingest(session, "remotive", "test", 10)
 
-            # Check that an IngestRun record was created with failed status
-            run = session.query(IngestRun).order_by(IngestRun.id.desc()).first()
-            assert run is not None
-            assert run.source == "remotive"
-            assert run.status == "failed"
-            assert run.error == "API connection failed"
-            assert run.finished_at is not None
+    # Check that an IngestRun record was created with failed status
+    run = session.execute(_LATEST_RUN).scalar_one_or_none()
+    assert run is not None
+    assert run.source == "remotive"
+    assert run.status == "failed"
+    assert run.error == "API connection failed"
+    assert run.finished_at is not None
 
 
-def test_ingest_with_empty_search():
+def test_ingest_with_empty_search(session, mock_fetch):
     """Test that empty search is stored as None."""
-    with patch("jobintel.etl.pipeline.fetch_from_source") as mock_fetch:
-        mock_fetch.return_value = ([], [])
+    mock_fetch.return_value = ([], [])
+
+    run_ingest(session, "remotive", "", 10)
+
+    run = session.execute(_LATEST_RUN).scalar_one_or_none()
+    assert run is not None
+    assert run.search is None
+
+
+def test_multi_source_ingest_logs_run_per_source(session, mock_fetch):
+    """Each source gets its own run; a failing source doesn't stop the others."""
+
+    def fake_fetch(source_name, search, limit):
+        if source_name == "remoteok":
+            raise ValueError("remoteok down")
+        payload = {
+            "source": source_name,
+            "title": f"{source_name} Engineer",
+            "url": f"https://example.com/{source_name}-multi",
+        }
+        return [payload], []
+
+    mock_fetch.side_effect = fake_fetch
+
+    with pytest.raises(ValueError, match="remoteok down"):
+        run_ingest_multi(session, ["remotive", "remoteok", "arbeitnow"], "", 10)
+
+    runs = {r.source: r for r in session.query(IngestRun).all()}
+    assert runs["remotive"].status == "success"
+    assert runs["remotive"].fetched == 1
+    assert runs["arbeitnow"].status == "success"
+    assert runs["remoteok"].status == "failed"
+    assert runs["remoteok"].error == "remoteok down"
+
+
+def test_multi_source_ingest_records_db_errors_in_etl(session, mock_fetch, monkeypatch):
+    """A database error during one source's ETL is recorded; later sources still run."""
+    real_etl = pipeline.run_etl_from_payloads
+
+    def etl_with_flush_error(session, payloads, environment=None):
+        if payloads[0]["source"] == "remotive":
+            session.add(IngestRun(source=None, status="running"))  # NOT NULL violation
+            session.flush()
+        return real_etl(session, payloads, environment)
+
+    monkeypatch.setattr(pipeline, "run_etl_from_payloads", etl_with_flush_error)
+    mock_fetch.side_effect = lambda source_name, search, limit: (
+        [make_payload(source=source_name, url=f"https://example.com/{source_name}-db")],
+        [],
+    )
+
+    with pytest.raises(IntegrityError):
+        run_ingest_multi(session, ["remotive", "arbeitnow"], "", 10)
+
+    runs = {r.source: r for r in session.query(IngestRun).all()}
+    assert runs.keys() == {"remotive", "arbeitnow"}
+    assert runs["remotive"].status == "failed"
+    assert "NOT NULL" in runs["remotive"].error
+    assert runs["remotive"].finished_at is not None
+    assert runs["arbeitnow"].status == "success"
+    assert runs["arbeitnow"].inserted_jobs == 1
+
+
+def test_ingest_writes_in_batches_not_per_row(session, mock_fetch):
+    """Raw jobs, jobs and skills are inserted per batch, never one statement per row."""
+    n = 2_500
+    fake_payloads = [
+        make_payload(
+            id=f"bulk-{i}",
+            title=f"Engineer {i}",
+            url=f"https://example.com/bulk-{i}",
+            description="Python and SQL",
+        )
+        for i in range(n)
+    ]
+
+    mock_fetch.return_value = (fake_payloads, [])
 
-        with SessionLocal() as session:
-            run_ingest(session, "remotive", "", 10)
+    with count_queries(session.connection()) as statements:
+        result = run_ingest(session, "remotive", "", n)
 
-            run = session.query(IngestRun).order_by(IngestRun.id.desc()).first()
-            assert run is not None
-            assert run.search is None
+    assert (result.inserted_raw, result.inserted_jobs, result.inserted_skills) == (n, n, 2 * n)
+    # Inserts with RETURNING go out in pages of insertmanyvalues_page_size rows (1000,
+    # also transform's batch size); job_skills needs no RETURNING, so one executemany.
+    pages = math.ceil(n / session.get_bind().dialect.insertmanyvalues_page_size)
+    inserts = Counter(s.split()[2] for s in statements if s.lstrip().startswith("INSERT"))
+    assert inserts == {"ingest_runs": 1, "raw_jobs": pages, "jobs": pages, "job_skills": 1}
@@ -0,0 +1,96 @@
+"""Statement-count guards for analytics queries.
+
+Each dashboard query should cost a fixed number of round trips regardless of
+how many jobs or skills exist; a lazy load creeping in would show up here.
+"""
+
+from datetime import date
+
+from fixtures import MAX_DISTINCT_SKILLS, count_queries
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT
+
+from jobintel.analytics.queries import (
+    PRODUCTION_ENV,
+    get_kpis,
+    get_skill_trends,
+    get_top_skills,
+    get_top_skills_by_source,
+)
+
+
+def test_get_kpis_statement_count(seeded_session):
+    """KPIs are four aggregate queries: total, last 7 days, companies, sources."""
+    with count_queries(seeded_session.connection()) as statements:
+        kpis = get_kpis(seeded_session, environment=PRODUCTION_ENV)
+
+    assert kpis["total_jobs"] == 4
+    assert len(statements) == 4
+
+
+def test_get_top_skills_single_statement(seeded_session):
+    """Top skills is one grouped query."""
+    with count_queries(seeded_session.connection()) as statements:
+        skills = get_top_skills(
+            seeded_session, limit=MAX_DISTINCT_SKILLS, environment=PRODUCTION_ENV
+        )
+
+    assert skills
+    assert len(statements) == 1
+
+
+def test_get_skill_trends_single_statement(seeded_session):
+    """Trends are bucketed in the database in a single query."""
+    with count_queries(seeded_session.connection()) as statements:
+        get_skill_trends(
+            seeded_session,
+            skills=["python", "docker", "aws"],
+            date_from=date(2020, 1, 1),
+            date_to=date(2100, 1, 1),
+            environment=PRODUCTION_ENV,
+        )
+
+    assert len(statements) == 1
+
+
+def test_get_top_skills_by_source_scales_with_sources_only(seeded_session):
+    """One query for the source list, then one per source, never per job."""
+    with count_queries(seeded_session.connection()) as statements:
+        results = get_top_skills_by_source(seeded_session, environment=PRODUCTION_ENV)
+
+    assert len(results) == 2
+    assert len(statements) == 1 + len(results)
+
+
+def test_analytics_queries_reuse_compiled_sql(seeded_session):
+    """Repeat calls hit SQLAlchemy's compiled-statement cache instead of recompiling.
+
+    Anything that bakes a value into the SQL string (text() with inlined values,
+    literal_binds) would make each call a cache miss.
+    """
+    hits = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        hits.append(context.cache_hit == CACHE_HIT)
+
+    def run_all():
+        get_kpis(seeded_session, environment=PRODUCTION_ENV)
+        get_top_skills(seeded_session, limit=3, environment=PRODUCTION_ENV)
+        get_skill_trends(
+            seeded_session,
+            skills=["python", "docker"],
+            date_from=date(2020, 1, 1),
+            date_to=date(2100, 1, 1),
+            environment=PRODUCTION_ENV,
+        )
+
+    run_all()
+    connection = seeded_session.connection()
+    event.listen(connection, "before_cursor_execute", _record)
+    try:
+        run_all()
+    finally:
+        event.remove(connection, "before_cursor_execute", _record)
+
+    assert hits
+    assert all(hits)
@@ -1,47 +1,75 @@
 """Tests for Arbeitnow job source."""
 
-from unittest.mock import MagicMock, patch
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import patch
+
+import pytest
 
 from jobintel.etl.sources.arbeitnow import (
+    REQUEST_DELAY_SECONDS,
     ArbeitnowSource,
     _normalize_job,
+    _page_delay,
     fetch_arbeitnow_jobs,
 )
 
-# Sample API response data
-SAMPLE_JOB = {
-    "slug": "software-engineer-berlin-123456",
-    "company_name": "TechCorp GmbH",
-    "title": "Software Engineer",
-    "description": "<p>Build amazing software.</p>",
-    "remote": True,
-    "url": "https://www.arbeitnow.com/jobs/companies/techcorp/software-engineer-123456",
-    "tags": ["Remote", "Software Development"],
-    "job_types": ["Full time"],
-    "location": "Berlin",
-    "created_at": 1700000000,  # Unix timestamp
-}
-
-SAMPLE_API_RESPONSE = {
-    "data": [SAMPLE_JOB],
-    "links": {
-        "first": "https://arbeitnow.com/api/job-board-api?page=1",
-        "last": None,
-        "prev": None,
-        "next": None,  # No next page
-    },
-    "meta": {
-        "current_page": 1,
-    },
-}
+# Sample API response data, read-only so a test mutating it fails instead of leaking
+SAMPLE_JOB = MappingProxyType(
+    {
+        "slug": "software-engineer-berlin-123456",
+        "company_name": "TechCorp GmbH",
+        "title": "Software Engineer",
+        "description": "<p>Build amazing software.</p>",
+        "remote": True,
+        "url": "https://www.arbeitnow.com/jobs/companies/techcorp/software-engineer-123456",
+        "tags": ["Remote", "Software Development"],
+        "job_types": ["Full time"],
+        "location": "Berlin",
+        "created_at": 1700000000,  # Unix timestamp
+    }
+)
+
+SAMPLE_API_RESPONSE = MappingProxyType(
+    {
+        "data": [SAMPLE_JOB],
+        "links": {
+            "first": "https://arbeitnow.com/api/job-board-api?page=1",
+            "last": None,
+            "prev": None,
+            "next": None,  # No next page
+        },
+        "meta": {
+            "current_page": 1,
+        },
+    }
+)
+
+
+def _stub(payload, headers=None):
+    """Minimal stand-in for a requests.Response returning `payload` as JSON."""
+    return SimpleNamespace(
+        json=lambda: payload, raise_for_status=lambda: None, headers=headers or {}
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_response():
+    """Single-page success response, built once and shared by the fetch tests."""
+    return _stub(SAMPLE_API_RESPONSE)
+
+
+@pytest.fixture(scope="module")
+def normalized_sample():
+    """_normalize_job(SAMPLE_JOB), computed once for the tests that only read it."""
+    return _normalize_job(SAMPLE_JOB)
 
 
 class TestNormalizeJob:
     """Tests for the _normalize_job function."""
 
-    def test_normalize_job_valid(self):
+    def test_normalize_job_valid(self, normalized_sample):
         """Test normalization of a valid job."""
-        result = _normalize_job(SAMPLE_JOB)
+        result = normalized_sample
 
         assert result is not None
         assert result["source"] == "arbeitnow"
@@ -57,23 +85,14 @@ class TestNormalizeJob:
         assert result["content_hash"] is not None
         assert result["posted_at"] is not None
 
-    def test_normalize_job_missing_url(self):
-        """Test normalization skips job without URL."""
-        job = {**SAMPLE_JOB, "url": None}
-        result = _normalize_job(job)
-        assert result is None
-
-    def test_normalize_job_missing_title(self):
-        """Test normalization skips job without title."""
-        job = {**SAMPLE_JOB, "title": None}
-        result = _normalize_job(job)
-        assert result is None
-
-    def test_normalize_job_empty_url(self):
-        """Test normalization skips job with empty URL."""
-        job = {**SAMPLE_JOB, "url": ""}
-        result = _normalize_job(job)
-        assert result is None
+    @pytest.mark.parametrize(
+        "override",
+        [{"url": None}, {"title": None}, {"url": ""}],
+        ids=["missing_url", "missing_title", "empty_url"],
+    )
+    def test_normalize_job_skips_without_url_or_title(self, override):
+        """Test normalization skips jobs without a URL or title."""
+        assert _normalize_job({**SAMPLE_JOB, **override}) is None
 
     def test_normalize_job_no_tags(self):
         """Test normalization handles job without tags."""
@@ -84,13 +103,24 @@ class TestNormalizeJob:
         assert result["tags"] is None
 
     def test_normalize_job_no_slug_uses_url_hash(self):
-        """Test normalization uses URL hash when slug is missing."""
+        """Test normalization keeps the md5 URL-hash fallback when slug is missing."""
+        import hashlib
+
         job = {**SAMPLE_JOB, "slug": None}
         result = _normalize_job(job)
 
         assert result is not None
         assert result["external_id"] is not None
-        assert len(result["external_id"]) == 16  # MD5 truncated to 16 chars
+        assert result["external_id"] == hashlib.md5(job["url"].encode()).hexdigest()[:16]
+
+    def test_normalize_job_content_hash_is_stable(self, normalized_sample):
+        """Test content_hash keeps the md5 of "title|company|description" used by stored rows."""
+        import hashlib
+
+        expected = hashlib.md5(
+            b"Software Engineer|TechCorp GmbH|<p>Build amazing software.</p>"
+        ).hexdigest()
+        assert normalized_sample["content_hash"] == expected
 
     def test_normalize_job_invalid_timestamp(self):
         """Test normalization handles invalid timestamp gracefully."""
@@ -104,13 +134,10 @@ class TestNormalizeJob:
 class TestFetchArbeitnowJobs:
     """Tests for the fetch_arbeitnow_jobs function."""
 
-    @patch("jobintel.etl.sources.arbeitnow.requests.get")
-    def test_fetch_success(self, mock_get):
+    @patch("jobintel.etl.sources.arbeitnow._SESSION.get")
+    def test_fetch_success(self, mock_get, sample_response):
         """Test successful fetch from Arbeitnow API."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = SAMPLE_API_RESPONSE
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
+        mock_get.return_value = sample_response
 
         payloads = fetch_arbeitnow_jobs()
 
@@ -119,8 +146,9 @@ class TestFetchArbeitnowJobs:
         assert payloads[0]["title"] == "Software Engineer"
         mock_get.assert_called_once()
 
-    @patch("jobintel.etl.sources.arbeitnow.requests.get")
-    def test_fetch_pagination(self, mock_get):
+    @patch("jobintel.etl.sources.arbeitnow.time.sleep")
+    @patch("jobintel.etl.sources.arbeitnow._SESSION.get")
+    def test_fetch_pagination(self, mock_get, _sleep):
         """Test fetch handles pagination."""
         page1_response = {
             **SAMPLE_API_RESPONSE,
@@ -131,22 +159,83 @@ class TestFetchArbeitnowJobs:
             "links": {"next": None},
         }
 
-        mock_response1 = MagicMock()
-        mock_response1.json.return_value = page1_response
-        mock_response1.raise_for_status = MagicMock()
+        mock_get.side_effect = [_stub(page1_response), _stub(page2_response)]
+
+        payloads = fetch_arbeitnow_jobs()
+
+        assert len(payloads) == 2
+        # Both pages go through the one keep-alive session
+        assert [c.kwargs["params"]["page"] for c in mock_get.call_args_list] == [1, 2]
+
+    @patch("jobintel.etl.sources.arbeitnow.time.sleep")
+    @patch("jobintel.etl.sources.arbeitnow._normalize_job", wraps=_normalize_job)
+    @patch("jobintel.etl.sources.arbeitnow._SESSION.get")
+    def test_fetch_skips_jobs_repeated_across_pages(self, mock_get, mock_normalize, _sleep):
+        """Test a job shifted onto the next page is only normalized and returned once."""
+        page1 = {
+            **SAMPLE_API_RESPONSE,
+            "links": {"next": "https://arbeitnow.com/api/job-board-api?page=2"},
+        }
+        page2 = {
+            "data": [SAMPLE_JOB, {**SAMPLE_JOB, "slug": "job-2", "url": "https://x/2"}],
+            "links": {"next": None},
+        }
+        mock_get.side_effect = [_stub(page1), _stub(page2)]
+
+        payloads = fetch_arbeitnow_jobs()
+
+        assert [p["external_id"] for p in payloads] == [SAMPLE_JOB["slug"], "job-2"]
+        assert mock_normalize.call_count == 2
+
+    @patch("jobintel.etl.sources.arbeitnow._normalize_job", wraps=_normalize_job)
+    @patch("jobintel.etl.sources.arbeitnow._SESSION.get")
+    def test_fetch_filters_before_normalizing(self, mock_get, mock_normalize, sample_response):
+        """Test jobs that don't match the search are never normalized."""
+        mock_get.return_value = sample_response
+
+        assert fetch_arbeitnow_jobs(search="Nonexistent") == []
+        mock_normalize.assert_not_called()
+
+    @patch("jobintel.etl.sources.arbeitnow.time.sleep")
+    @patch("jobintel.etl.sources.arbeitnow._SESSION.get")
+    def test_fetch_stops_before_delay_when_limit_reached(self, mock_get, mock_sleep):
+        """Test fetch doesn't wait for or request another page once limit is met."""
+        mock_get.return_value = _stub(
+            {
+                **SAMPLE_API_RESPONSE,
+                "links": {"next": "https://arbeitnow.com/api/job-board-api?page=2"},
+            }
+        )
 
-        mock_response2 = MagicMock()
-        mock_response2.json.return_value = page2_response
-        mock_response2.raise_for_status = MagicMock()
+        payloads = fetch_arbeitnow_jobs(limit=1)
 
-        mock_get.side_effect = [mock_response1, mock_response2]
+        assert len(payloads) == 1
+        mock_get.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch("jobintel.etl.sources.arbeitnow.time.sleep")
+    @patch("jobintel.etl.sources.arbeitnow._SESSION.get")
+    def test_fetch_only_sleeps_when_rate_limit_exhausted(self, mock_get, mock_sleep):
+        """Test the inter-page delay follows X-RateLimit-Remaining."""
+        pages = []
+        for i, remaining in enumerate(["5", "0", "4"], start=1):
+            next_url = f"https://arbeitnow.com/api/job-board-api?page={i + 1}" if i < 3 else None
+            body = {"data": [{**SAMPLE_JOB, "slug": f"job-{i}"}], "links": {"next": next_url}}
+            pages.append(_stub(body, headers={"X-RateLimit-Remaining": remaining}))
+        mock_get.side_effect = pages
 
         payloads = fetch_arbeitnow_jobs()
 
-        assert len(payloads) == 2
-        assert mock_get.call_count == 2
+        assert len(payloads) == 3
+        mock_sleep.assert_called_once_with(REQUEST_DELAY_SECONDS)
 
-    @patch("jobintel.etl.sources.arbeitnow.requests.get")
+    def test_page_delay_defaults_without_rate_limit_headers(self):
+        """Test the conservative delay is kept when the API sends no quota info."""
+        assert _page_delay({}) == REQUEST_DELAY_SECONDS
+        assert _page_delay({"X-RateLimit-Remaining": "n/a"}) == REQUEST_DELAY_SECONDS
+        assert _page_delay({"X-RateLimit-Remaining": "10"}) == 0.0
+
+    @patch("jobintel.etl.sources.arbeitnow._SESSION.get")
     def test_fetch_api_error(self, mock_get):
         """Test fetch handles API errors gracefully."""
         import requests
@@ -157,13 +246,10 @@ class TestFetchArbeitnowJobs:
 
         assert payloads == []
 
-    @patch("jobintel.etl.sources.arbeitnow.requests.get")
+    @patch("jobintel.etl.sources.arbeitnow._SESSION.get")
     def test_fetch_empty_response(self, mock_get):
         """Test fetch handles empty data array."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"data": [], "links": {}}
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
+        mock_get.return_value = _stub({"data": [], "links": {}})
 
         payloads = fetch_arbeitnow_jobs()
 
@@ -178,13 +264,10 @@ class TestArbeitnowSource:
         source = ArbeitnowSource()
         assert source.name == "arbeitnow"
 
-    @patch("jobintel.etl.sources.arbeitnow.requests.get")
-    def test_source_fetch(self, mock_get):
+    @patch("jobintel.etl.sources.arbeitnow._SESSION.get")
+    def test_source_fetch(self, mock_get, sample_response):
         """Test source.fetch() delegates to fetch_arbeitnow_jobs."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = SAMPLE_API_RESPONSE
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
+        mock_get.return_value = sample_response
 
         source = ArbeitnowSource()
         payloads = source.fetch(search="", limit=100)
@@ -192,13 +275,10 @@ class TestArbeitnowSource:
         assert len(payloads) == 1
         assert payloads[0]["source"] == "arbeitnow"
 
-    @patch("jobintel.etl.sources.arbeitnow.requests.get")
-    def test_source_fetch_with_search(self, mock_get):
+    @patch("jobintel.etl.sources.arbeitnow._SESSION.get")
+    def test_source_fetch_with_search(self, mock_get, sample_response):
         """Test source.fetch() with search filter."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = SAMPLE_API_RESPONSE
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
+        mock_get.return_value = sample_response
 
         source = ArbeitnowSource()
 
@@ -209,3 +289,22 @@ class TestArbeitnowSource:
         # Search for "Nonexistent" should not match
         payloads = source.fetch(search="Nonexistent", limit=100)
         assert len(payloads) == 0
+
+    @patch("jobintel.etl.sources.arbeitnow._SESSION.get")
+    def test_source_fetch_with_multi_term_search(self, mock_get, sample_response):
+        """Test comma-separated search terms match if any term is present."""
+        mock_get.return_value = sample_response
+
+        source = ArbeitnowSource()
+
+        assert len(source.fetch(search="rust, techcorp", limit=100)) == 1
+        assert len(source.fetch(search="rust, golang", limit=100)) == 0
+
+
+def test_session_retries_rate_limits():
+    """Test the shared session retries 429 instead of a hand-rolled loop."""
+    from jobintel.etl.sources.arbeitnow import _SESSION
+
+    retry = _SESSION.get_adapter("https://arbeitnow.com").max_retries
+    assert retry.total == 3
+    assert 429 in retry.status_forcelist
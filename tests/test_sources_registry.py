@@ -1,10 +1,17 @@
 """Tests for source registry and validation."""
 
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
 import pytest
+import requests
 
 from jobintel.etl.sources.base import validate_payload, validate_payloads
 from jobintel.etl.sources.registry import get_source, list_sources
 
+# Read once at collection time to parametrize the per-source tests
+REGISTERED_SOURCES = list_sources()
+
 
 def test_validate_payload_valid():
     """Test validation with valid payload."""
@@ -56,10 +63,11 @@ def test_list_sources_returns_registered():
     assert "remoteok" in sources
 
 
-def test_get_source_returns_valid_source():
+@pytest.mark.parametrize("source_name", REGISTERED_SOURCES)
+def test_get_source_returns_valid_source(source_name):
     """Test get_source returns a valid source."""
-    source = get_source("remotive")
-    assert source.name == "remotive"
+    source = get_source(source_name)
+    assert source.name == source_name
     assert hasattr(source, "fetch")
 
 
@@ -69,10 +77,40 @@ def test_get_source_unknown_raises():
         get_source("nonexistent")
 
 
-def test_source_fetch_signature():
+@pytest.fixture
+def empty_http_response(monkeypatch):
+    """Answer every source's HTTP GET with an empty JSON body instead of the network."""
+    response = SimpleNamespace(json=dict, raise_for_status=lambda: None, headers={})
+    get = MagicMock(return_value=response)
+    monkeypatch.setattr(requests.Session, "get", get)
+    return get
+
+
+@pytest.mark.parametrize("source_name", REGISTERED_SOURCES)
+def test_source_fetch_signature(source_name, empty_http_response):
     """Test that registered sources have correct fetch signature."""
-    for source_name in list_sources():
-        source = get_source(source_name)
-        # Should have fetch method that accepts search and limit
-        payloads = source.fetch(search="test", limit=1)
-        assert isinstance(payloads, list)
+    source = get_source(source_name)
+    # Should have fetch method that accepts search and limit
+    payloads = source.fetch(search="test", limit=1)
+    assert isinstance(payloads, list)
+    empty_http_response.assert_called_once()
+
+
+def test_get_source_imports_only_requested_module(monkeypatch):
+    """Test get_source loads a source module lazily, on first request."""
+    import sys
+
+    import jobintel.etl.sources as sources_pkg
+    from jobintel.etl.sources import registry
+
+    monkeypatch.setattr(registry, "_SOURCES", {})
+    for name, module in registry._SOURCE_MODULES.items():
+        monkeypatch.delitem(sys.modules, module, raising=False)
+        monkeypatch.delattr(sources_pkg, name, raising=False)
+
+    assert list_sources() == ["arbeitnow", "remoteok", "remotive"]
+    assert "jobintel.etl.sources.remoteok" not in sys.modules
+
+    assert get_source("remoteok").name == "remoteok"
+    assert "jobintel.etl.sources.remoteok" in sys.modules
+    assert "jobintel.etl.sources.remotive" not in sys.modules
@@ -8,3 +8,10 @@ def test_strip_html_removes_tags():
     assert "world" in out
     assert "&" in out
     assert "<b>" not in out
+
+
+def test_strip_html_keeps_stray_angle_brackets():
+    s = "<p>Salary < 100k</p>" + " a < b" * 2000
+    out = _strip_html(s)
+    assert out.startswith("Salary < 100k")
+    assert "<p>" not in out